@@ -0,0 +1,215 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from benchmarks import baseline
+from benchmarks.synthetic import SITE, SIZES, synthetic_station, write_station_csv
+from lebaron import lebaron
+from lebaron.kernel import KERNEL, fused_lebaron
+from lebaron.pipeline import correct_blocks, write_csv
+from lebaron.reader import read_station_csv
+from lebaron.shadowband import SolarMeasurement, SolarMeasurementSet
+from lebaron.vectorized import dif_correction, solar_geometry
+from qcontrol.qcontrol import limit_flags, qc_flags
+
+'''
+Benchmarks of the correction and QC stages over synthetic minute data of 1 day, 1 month, 1 year and 10 years, run
+offline from the repository root:
+
+    python -m benchmarks.benchmark --output results.json [--compare previous.json]
+
+Each stage is timed once and run a second time under tracemalloc for its peak memory. The per row APIs
+(SolarMeasurement and lebaron.lebaron) are timed on the first --scalar-rows rows of each size only.
+The script exits with status 1 when SolarMeasurement is slower than the original class of benchmarks/baseline.py.
+'''
+
+
+def run_stage(name, size, rows, function, memory=True):
+    """
+    Times function() and measures the peak memory it allocates
+
+    Parameters
+    ----------
+    name : str
+        stage name
+    size : str
+        data size label
+    rows : int
+        rows processed by function
+    function : callable
+        stage to run, without arguments
+    memory : bool
+        run it again under tracemalloc for the peak memory
+
+    Returns
+    -------
+    result : dict
+        stage, size, rows, seconds, rows_per_second and peak_mb (None when not measured)
+    """
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+    peak_mb = None
+    if memory:
+        tracemalloc.start()
+        function()
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    return dict(stage=name, size=size, rows=rows, seconds=seconds,
+                rows_per_second=rows / seconds if seconds > 0 else None, peak_mb=peak_mb)
+
+
+def benchmark_size(size, days, scalar_rows, directory, memory=True):
+    """
+    Runs every stage on one size of synthetic data
+
+    Parameters
+    ----------
+    size : str
+        data size label
+    days : int
+        days of minute data
+    scalar_rows : int
+        rows given to the per row APIs
+    directory : str
+        directory of the temporary station files
+    memory : bool
+        measure the peak memory of each stage
+
+    Returns
+    -------
+    results : list of dict
+        one run_stage() result per stage
+    """
+    station = synthetic_station(days)
+    rows = len(station.dates)
+    sample = min(rows, scalar_rows)
+    sample_dates = pd.DatetimeIndex(station.dates[:sample]).to_pydatetime()
+    sample_glo_h = station.glo_h[:sample].tolist()
+    sample_dif_hu = station.dif_hu[:sample].tolist()
+    site = tuple(SITE.values())
+    results = []
+
+    def run(name, stage_rows, function):
+        results.append(run_stage(name, size, stage_rows, function, memory=memory))
+
+    def construct():
+        return [SolarMeasurement(date, glo_h, dif_hu, *site)
+                for date, glo_h, dif_hu in zip(sample_dates, sample_glo_h, sample_dif_hu)]
+
+    def class_factor():
+        SolarMeasurement.geometry_cache.clear()  # Every run starts cold
+        return [measurement.dif_correction_factor for measurement in construct()]
+
+    geometry = solar_geometry(station.dates, *site)
+    fused_lebaron(geometry, station.glo_h, station.dif_hu)  # Compiles the kernel outside of the timing
+    run("class_construction", sample, construct)
+    run("class_factor", sample, class_factor)
+    run("baseline_class_factor", sample, lambda: [baseline.SolarMeasurement(date, glo_h, dif_hu,
+                                                                            *site).dif_correction_factor
+                                                  for date, glo_h, dif_hu in zip(sample_dates, sample_glo_h,
+                                                                                 sample_dif_hu)])
+    run("functional_factor", sample, lambda: [lebaron.set_dif_correction_factor(date, glo_h, dif_hu, SITE["lat"],
+                                                                                SITE["lng"], SITE["lng_std"],
+                                                                                SITE["shadowband_width"],
+                                                                                SITE["shadowband_radius"],
+                                                                                SITE["altitude"])
+                                              for date, glo_h, dif_hu in zip(sample_dates, sample_glo_h,
+                                                                             sample_dif_hu)])
+    run("set_construction", rows, lambda: SolarMeasurementSet(station.dates, station.glo_h, station.dif_hu, *site))
+    run("vectorized_factor", rows, lambda: dif_correction(station.dates, station.glo_h, station.dif_hu, *site))
+    run("solar_geometry", rows, lambda: solar_geometry(station.dates, *site))
+    run(f"fused_factor_{KERNEL}", rows, lambda: fused_lebaron(geometry, station.glo_h, station.dif_hu))
+    run("qc_limits", rows, lambda: limit_flags(station.glo_h, station.dif_hu, geometry.zenithal_angle, geometry.gon))
+    run("qc_flags", rows, lambda: qc_flags(station.glo_h, station.dif_hu, geometry.zenithal_angle, geometry.gon))
+
+    input_path = os.path.join(directory, "station.csv")
+    output_path = os.path.join(directory, "station-corrected.csv")
+    write_station_csv(station, input_path)
+    run("io_read_csv", rows, lambda: sum(len(block.dates) for block in read_station_csv(input_path)))
+    corrected = list(correct_blocks(read_station_csv(input_path), *site))
+    run("io_write_csv", rows, lambda: sum(len(block.dates) for block in write_csv(corrected, output_path)))
+    return results
+
+
+def compare(results, previous):
+    """
+    Prints the throughput ratio (rows/s now over rows/s before) of each stage against a previous results file
+
+    Parameters
+    ----------
+    results : list of dict
+        current results
+    previous : dict
+        contents of a JSON file written by this script
+    """
+    before = {(result["stage"], result["size"]): result for result in previous["results"]}
+    for result in results:
+        old = before.get((result["stage"], result["size"]))
+        if old is not None and result["rows_per_second"] and old["rows_per_second"]:
+            print(f"{result['size']:>9} {result['stage']:<24} "
+                  f"{result['rows_per_second'] / old['rows_per_second']:8.2f}x")
+
+
+def slower_than_baseline(results):
+    """
+    Sizes where SolarMeasurement computed its correction factors slower than the original class of
+    benchmarks/baseline.py
+
+    Parameters
+    ----------
+    results : list of dict
+        benchmark_size() results
+
+    Returns
+    -------
+    sizes : list of str
+        sizes whose class_factor rows/s is below the baseline_class_factor rows/s
+    """
+    rates = {(result["stage"], result["size"]): result["rows_per_second"] or 0 for result in results}
+    return [size for stage, size in rates if stage == "class_factor" and
+            rates[stage, size] < rates.get(("baseline_class_factor", size), 0)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks of the correction and QC stages on synthetic data")
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), choices=list(SIZES))
+    parser.add_argument("--scalar-rows", type=int, default=10000, help="rows given to the per row APIs")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc runs")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    arguments = parser.parse_args()
+
+    results = []
+    # Night and zero diffuse rows divide by zero in SolarMeasurement, as they do in production
+    with tempfile.TemporaryDirectory() as directory, np.errstate(divide="ignore", invalid="ignore"):
+        for size in arguments.sizes:
+            for result in benchmark_size(size, SIZES[size], arguments.scalar_rows, directory,
+                                         memory=not arguments.no_memory):
+                peak_mb = "" if result["peak_mb"] is None else f"{result['peak_mb']:9.1f} MB"
+                print(f"{result['size']:>9} {result['stage']:<24} {result['rows']:>9} rows {result['seconds']:9.4f} s "
+                      f"{result['rows_per_second'] or 0:14,.0f} rows/s {peak_mb}")
+                results.append(result)
+    meta = dict(date=datetime.now().isoformat(timespec="seconds"), python=platform.python_version(),
+                numpy=np.__version__, pandas=pd.__version__, kernel=KERNEL, machine=platform.machine(),
+                cpus=os.cpu_count())
+    with open(arguments.output, "w") as file:
+        json.dump(dict(meta=meta, results=results), file, indent=1)
+    if arguments.compare:
+        with open(arguments.compare) as file:
+            compare(results, json.load(file))
+    slower = slower_than_baseline(results)
+    if slower:
+        print(f"SolarMeasurement is slower than benchmarks/baseline.py on {', '.join(slower)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
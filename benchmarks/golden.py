@@ -0,0 +1,219 @@
+import argparse
+import sys
+import time
+import numpy as np
+import pandas as pd
+from benchmarks import baseline
+from benchmarks.synthetic import SITE, synthetic_station
+from lebaron import lebaron
+from lebaron.ephemeris import Ephemeris
+from lebaron.kernel import fused_lebaron, numba
+from lebaron.multisite import dif_correction_factors
+from lebaron.pipeline import correct_blocks
+from lebaron.reader import StationBlock
+from lebaron.shadowband import SolarMeasurement, SolarMeasurementSet
+from lebaron.vectorized import dif_correction, solar_geometry
+
+'''
+Golden data regression gate: every engine, the rewritten SolarMeasurement and lebaron.lebaron included, must reproduce
+the factors of the original implementations frozen in benchmarks.baseline on a synthetic year at several latitudes.
+Run from the repository root:
+
+    python -m benchmarks.golden record golden.npz    # references from benchmarks.baseline
+    python -m benchmarks.golden check golden.npz     # exits with 1 if any engine departs from them
+
+The tests suite (python -m pytest) makes the same comparison on a few days at three latitudes, in seconds.
+
+Cuts and correction factors must match exactly, NaN (None in the per row APIs) in the same rows. Zenith angle, C_i,
+epsilon and delta must match within RTOL: the vectorized delta divides by gon in another order and may differ from
+the scalar one in the last bit.
+'''
+
+LATITUDES = (-60, -32.898, 0, 23.44, 45, 60)  # Inside the polar circles solarpy raises NoSunsetNoSunrise
+YEAR = 2022
+RTOL = 1e-12
+CUTS = ("zenith_cut", "geometric_cut", "epsilon_cut", "delta_cut")
+QUANTITIES = ("zenithal_angle", "c_i", "epsilon", "delta")
+
+
+def golden_inputs(lat, step_minutes):
+    """
+    Synthetic year of one latitude, one row every step_minutes minutes
+    """
+    station = synthetic_station(365, start=f"{YEAR}-01-01", lat=lat, seed=int(round(lat * 1000)) % 2 ** 32)
+    return tuple(column[::step_minutes] for column in station)
+
+
+def record(path, latitudes=LATITUDES, step_minutes=10):
+    """
+    Records the reference outputs of the original SolarMeasurement and set_dif_correction_factor(), frozen in
+    benchmarks.baseline
+
+    Parameters
+    ----------
+    path : str
+        golden .npz file, overwritten
+    latitudes : sequence of float
+        latitudes of the synthetic sites, the rest of the site is benchmarks.synthetic.SITE
+    step_minutes : int
+        minutes between rows of the synthetic year
+    """
+    golden = dict(latitudes=np.array(latitudes, dtype=np.float64), step_minutes=step_minutes)
+    for number, lat in enumerate(latitudes):
+        dates, glo_h, dif_hu = golden_inputs(lat, step_minutes)
+        site = dict(SITE, lat=lat)
+        class_columns = {name: [] for name in QUANTITIES + CUTS + ("dif_correction_factor",)}
+        functional = []
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for date, glo, dif in zip(pd.DatetimeIndex(dates).to_pydatetime(), glo_h.tolist(), dif_hu.tolist()):
+                measurement = baseline.SolarMeasurement(date, glo, dif, **site)
+                for name in QUANTITIES:
+                    class_columns[name].append(getattr(measurement, name))
+                for name, value in zip(CUTS, measurement.lebaron_parameters):
+                    class_columns[name].append(value)
+                class_columns["dif_correction_factor"].append(measurement.dif_correction_factor)
+                functional.append(baseline.set_dif_correction_factor(
+                    date, glo, dif, lat, site["lng"], site["lng_std"], site["shadowband_width"],
+                    site["shadowband_radius"], site["altitude"]))
+        golden.update({f"{number}/dates": dates, f"{number}/glo_h": glo_h, f"{number}/dif_hu": dif_hu,
+                       f"{number}/functional_factor": _none_to_nan(functional)})
+        golden.update({f"{number}/{name}": _none_to_nan(values) for name, values in class_columns.items()})
+        print(f"recorded {len(dates)} rows at latitude {lat}")
+    np.savez_compressed(path, **golden)
+
+
+def check(path, scalar_rows=2000):
+    """
+    Checks every engine against the golden file and reports its speed ratio to SolarMeasurement
+
+    Parameters
+    ----------
+    path : str
+        golden .npz file written by record()
+    scalar_rows : int
+        rows timed through SolarMeasurement for the speed ratios
+
+    Returns
+    -------
+    passed : bool
+        True if every engine matches the references of every latitude
+    """
+    passed = True
+    with np.load(path) as data:
+        golden = dict(data)
+    for number, lat in enumerate(golden["latitudes"]):
+        lat = float(lat)
+        site = dict(SITE, lat=lat)
+        dates, glo_h, dif_hu = (golden[f"{number}/{name}"] for name in ("dates", "glo_h", "dif_hu"))
+        reference = {name: golden[f"{number}/{name}"] for name in QUANTITIES + CUTS + ("dif_correction_factor",)}
+        class_rate = _class_rows_per_second(dates[:scalar_rows], glo_h[:scalar_rows], dif_hu[:scalar_rows], site)
+        for engine, function in _engines(site).items():
+            function(dates[:10], glo_h[:10], dif_hu[:10])  # Compiles or loads the Numba kernel outside of the timing
+            start = time.perf_counter()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                result = function(dates, glo_h, dif_hu)
+            seconds = time.perf_counter() - start
+            if engine == "functional":
+                reference_engine = dict(dif_correction_factor=golden[f"{number}/functional_factor"])
+            else:
+                reference_engine = reference
+            failures = _compare(result, reference_engine)
+            passed = passed and not failures
+            ratio = len(dates) / seconds / class_rate if seconds > 0 else np.inf
+            print(f"latitude {lat:>8} {engine:<20} {'ok' if not failures else 'FAILED':<6} "
+                  f"{ratio:10.1f}x SolarMeasurement {'; '.join(failures)}")
+    return passed
+
+
+def _engines(site):
+    site_values = tuple(site.values())
+    ephemeris = Ephemeris.build(YEAR, *site_values)
+
+    def fused(kernel):
+        def function(dates, glo_h, dif_hu):
+            geometry = solar_geometry(dates, *site_values)
+            return dict(zip(CUTS + ("dif_correction_factor",),
+                            fused_lebaron(geometry, glo_h, dif_hu, cuts=True, kernel=kernel)))
+        return function
+
+    def measurement(dates, glo_h, dif_hu):
+        rows = [SolarMeasurement(date, glo, dif, **site)
+                for date, glo, dif in zip(pd.DatetimeIndex(dates).to_pydatetime(), glo_h.tolist(), dif_hu.tolist())]
+        columns = {name: _none_to_nan(getattr(row, name) for row in rows)
+                   for name in QUANTITIES + ("dif_correction_factor",)}
+        columns.update(zip(CUTS, np.array([row.lebaron_parameters for row in rows], dtype=np.float64).T))
+        return columns
+
+    def pipeline(dates, glo_h, dif_hu):
+        block, = correct_blocks([StationBlock(dates, glo_h, dif_hu)], *site_values)
+        return block._asdict()
+
+    engines = {
+        "class": measurement,
+        "functional": lambda dates, glo_h, dif_hu: dict(dif_correction_factor=_none_to_nan(
+            lebaron.set_dif_correction_factor(date, glo, dif, site["lat"], site["lng"], site["lng_std"],
+                                              site["shadowband_width"], site["shadowband_radius"], site["altitude"])
+            for date, glo, dif in zip(pd.DatetimeIndex(dates).to_pydatetime(), glo_h.tolist(), dif_hu.tolist()))),
+        "vectorized": lambda dates, glo_h, dif_hu: dif_correction(dates, glo_h, dif_hu, *site_values)._asdict(),
+        "vectorized_threads": lambda dates, glo_h, dif_hu: dif_correction(dates, glo_h, dif_hu, *site_values,
+                                                                          workers=4)._asdict(),
+        "ephemeris": lambda dates, glo_h, dif_hu: dif_correction(dates, glo_h, dif_hu, *site_values,
+                                                                 ephemeris=ephemeris)._asdict(),
+        "measurement_set": lambda dates, glo_h, dif_hu: vars(SolarMeasurementSet(dates, glo_h, dif_hu,
+                                                                                 *site_values)),
+        "fused_numpy": fused("numpy"),
+        "pipeline": pipeline,
+        "multisite": lambda dates, glo_h, dif_hu: dict(dif_correction_factor=dif_correction_factors(
+            dates, glo_h, dif_hu, [site_values])[0]),
+    }
+    if numba is not None:
+        engines["fused_numba"] = fused("numba")
+    return engines
+
+
+def _compare(result, reference):
+    failures = []
+    for name, expected in reference.items():
+        if name not in result:
+            continue
+        actual = np.asarray(result[name], dtype=np.float64)
+        if name in QUANTITIES:
+            with np.errstate(invalid="ignore"):
+                matches = np.isclose(actual, expected, rtol=RTOL, atol=0, equal_nan=True) | (actual == expected)
+        else:
+            matches = (actual == expected) | (np.isnan(actual) & np.isnan(expected))
+        if not matches.all():
+            row = int(np.flatnonzero(~matches)[0])
+            failures.append(f"{name}: {int((~matches).sum())} rows differ, first at row {row} "
+                            f"({actual[row]!r} instead of {expected[row]!r})")
+    return failures
+
+
+def _class_rows_per_second(dates, glo_h, dif_hu, site):
+    SolarMeasurement.geometry_cache.clear()
+    start = time.perf_counter()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for date, glo, dif in zip(pd.DatetimeIndex(dates).to_pydatetime(), glo_h.tolist(), dif_hu.tolist()):
+            SolarMeasurement(date, glo, dif, **site).dif_correction_factor
+    return len(dates) / (time.perf_counter() - start)
+
+
+def _none_to_nan(values):
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Golden data regression gate of the LeBaron engines")
+    parser.add_argument("command", choices=("record", "check"))
+    parser.add_argument("path", help="golden .npz file")
+    parser.add_argument("--step-minutes", type=int, default=10, help="minutes between recorded rows")
+    parser.add_argument("--latitudes", type=float, nargs="+", default=list(LATITUDES))
+    arguments = parser.parse_args()
+    if arguments.command == "record":
+        record(arguments.path, arguments.latitudes, arguments.step_minutes)
+    elif not check(arguments.path):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
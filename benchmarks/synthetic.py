@@ -0,0 +1,65 @@
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+from lebaron.reader import DATE_FORMAT
+from lebaron.vectorized import solar_geometry
+
+# Mendoza site of examples/dif_correction.py
+SITE = dict(lat=-32.898, lng=-68.875, lng_std=-45, altitude=842, shadowband_width=7.5, shadowband_radius=30.8)
+
+SIZES = {"1 day": 1, "1 month": 31, "1 year": 365, "10 years": 3652}  # Days of minute data
+
+
+class SyntheticStation(NamedTuple):
+    dates: np.ndarray  # datetime64[ns], one per minute
+    glo_h: np.ndarray
+    dif_hu: np.ndarray
+
+
+def synthetic_station(days, start="2022-01-01", lat=SITE["lat"], seed=0):
+    """
+    Deterministic minute data of a station: clear sky GHI from the zenith angle dimmed by random clouds, DIF as a
+    cloud dependent fraction of it, sensor noise around zero at night and a few NaN gaps
+
+    Parameters
+    ----------
+    days : int
+        number of days
+    start : str
+        first day
+    lat : float
+        latitude (-90 to 90) in degrees, the rest of the site is SITE
+    seed : int
+        seed of the random generator
+
+    Returns
+    -------
+    station : SyntheticStation
+    """
+    rng = np.random.default_rng(seed)
+    dates = np.datetime64(start, "ns") + np.arange(days * 1440) * np.timedelta64(1, "m")
+    site = dict(SITE, lat=lat)
+    geometry = solar_geometry(dates, **site)
+    cos_zenith = np.clip(np.cos(geometry.zenithal_angle), 0, None)
+    # Cloudiness varies by the hour so that clear and overcast spells span the four epsilon and delta cuts
+    clouds = np.repeat(rng.beta(0.8, 0.8, size=days * 24), 60)
+    glo_h = 1100 * cos_zenith ** 1.15 * (1 - 0.6 * clouds) + rng.normal(0, 1.5, len(dates))
+    dif_hu = glo_h * (0.15 + 0.85 * clouds) * rng.uniform(0.9, 1.0, len(dates)) + rng.normal(0, 1, len(dates))
+    gaps = rng.random(len(dates)) < 1e-3
+    glo_h[gaps] = np.nan
+    dif_hu[gaps] = np.nan
+    return SyntheticStation(dates, np.round(glo_h, 1), np.round(dif_hu, 1))
+
+
+def write_station_csv(station, path):
+    """
+    Writes a SyntheticStation in the station file format read by lebaron.reader.read_station_csv()
+
+    Parameters
+    ----------
+    station : SyntheticStation
+    path : str
+        output file, overwritten
+    """
+    pd.DataFrame({"fecha": pd.DatetimeIndex(station.dates).strftime(DATE_FORMAT), "IRGLO": station.glo_h,
+                  "IRDIF": station.dif_hu}).to_csv(path, sep=";", index=False)
@@ -1,6 +1,6 @@
 import matplotlib.pyplot as plt
-import numpy as np
 import pandas as pd
+from qcontrol.integrity import check_timestamps, reindex_to_grid
 
 # File reading
 file_df = pd.read_csv("../data/2022-minute-raw.csv", sep=";")
@@ -9,22 +9,20 @@ file_df.sort_values(by=["fecha"], inplace=True)
 file_df.reset_index(inplace=True)
 
 # ---------- Checking timestamps integrity ----------
-complete_timestamps = set(pd.date_range(start=f"2022-01-01 00:00", end=f"2022-12-31 23:59", freq="min"))
-file_timestamps = set(file_df.fecha)
+integrity = check_timestamps(file_df["fecha"], freq="min", start="2022-01-01 00:00", end="2022-12-31 23:59")
 
 # Checking for missing timestamps
-missing_timestamps = complete_timestamps.difference(file_timestamps)
-print(f"Found {len(missing_timestamps)} missing of {len(complete_timestamps)} timestamps"
-      f" ({len(missing_timestamps)/len(complete_timestamps)* 100:.2f}%)")
+print(f"Found {integrity.missing_count} missing of {integrity.expected} timestamps"
+      f" ({integrity.missing_count/integrity.expected * 100:.2f}%) in {len(integrity.missing)} gaps")
 
 # Checking for repeated timestamps
-repeated_timestamps = file_df[file_df["fecha"].duplicated()]
-print(f"Found {len(repeated_timestamps)} repeated timestamps"
-      f" ({len(repeated_timestamps)/len(file_df['fecha']):.2f}%)")
-missing_df = pd.DataFrame({"fecha": list(missing_timestamps), "ILGLO": np.nan, "IRGLO": np.nan, "ILDIF": np.nan,
-                           "IRDIF": np.nan}, index=list(missing_timestamps))
-full_df = pd.concat([file_df, missing_df]).sort_values(by=["fecha"])
-full_df.reset_index()
+repeated_timestamps = int((integrity.duplicates[:, 1] - integrity.duplicates[:, 0]).sum())
+print(f"Found {repeated_timestamps} repeated timestamps"
+      f" ({repeated_timestamps/len(file_df['fecha']):.2f}%)")
+grid, columns = reindex_to_grid(file_df["fecha"], file_df["ILGLO"], file_df["IRGLO"], file_df["ILDIF"],
+                                file_df["IRDIF"], freq="min", start="2022-01-01 00:00", end="2022-12-31 23:59")
+full_df = pd.DataFrame(dict(zip(["ILGLO", "IRGLO", "ILDIF", "IRDIF"], columns)), index=grid)
+full_df.insert(0, "fecha", grid)
 
 # ----------
 
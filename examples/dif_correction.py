@@ -2,6 +2,8 @@ import matplotlib.pyplot as plt
 from datetime import datetime
 import pandas as pd
 from lebaron.shadowband import *
+from lebaron.vectorized import lebaron_from_geometry, solar_geometry
+from qcontrol.qcontrol import qc_flags
 
 '''
 Script para corregir los datos de radiación difusa tomados con banda de sombra. Se emplea LeBaron para la corrección.
@@ -27,14 +29,15 @@ file_df['fecha'] = pd.to_datetime(file_df['fecha'], format="%d/%m/%Y %H:%M")
 file_df.sort_values(by=["fecha"], inplace=True)
 file_df.reset_index(inplace=True)
 
-# Cálculo de coeficietes de corrección de difusa por medio de LeBaron
-measurements_list = [SolarMeasurement(date, ghi, dif, lat=latitud, lng=longitud, lng_std=longitud_std, altitude=altitud,
-                                      shadowband_width=b, shadowband_radius=r) for date, ghi, dif
-                     in zip(file_df["fecha"], file_df["IRGLO"], file_df["IRDIF"])]
-lebaron_list = [solar_measurement.dif_correction_factor for solar_measurement in measurements_list]
-corrected_dif = pd.Series(lebaron_list) * file_df["IRDIF"]
-corrected_dif = [value if np.isnan(corrected_dif[index]) else corrected_dif[index] for index, value in
-                 enumerate(file_df["IRDIF"])]
+# Geometría solar de todas las filas, compartida por LeBaron y por los controles de calidad
+geometry = solar_geometry(file_df["fecha"], lat=latitud, lng=longitud, lng_std=longitud_std, altitude=altitud,
+                          shadowband_width=b, shadowband_radius=r)
+
+# Cálculo de coeficietes de corrección de difusa por medio de LeBaron (todas las filas en una sola pasada)
+lebaron_result = lebaron_from_geometry(geometry, file_df["IRGLO"].to_numpy(), file_df["IRDIF"].to_numpy())
+corrected_dif = lebaron_result.dif_correction_factor * file_df["IRDIF"]
+# Donde no hay factor de corrección se conserva la difusa medida
+corrected_dif = corrected_dif.where(~np.isnan(corrected_dif), file_df["IRDIF"])
 
 # Plot
 # plt.plot(file_df["IRDIF"])
@@ -42,27 +45,10 @@ corrected_dif = [value if np.isnan(corrected_dif[index]) else corrected_dif[inde
 # plt.show()
 
 file_df["IRDIFc"] = corrected_dif
-file_df.to_csv("2022-minute-dif_corrected.csv")
 
-# measurements_series = pd.Series(map(lambda date, ghi, dif: SolarMeasurement(date, ghi, dif, lat=latitud, lng=longitud,
-#                                                                             lng_std=longitud_std, altitude=altitud,
-#                                                                             shadowband_width=b, shadowband_radius=r),
-#                                     file_df["fecha"], file_df["IRGLO"], file_df["IRDIF"]))
-# lebaron_series = measurements_series.map(lambda measurement: measurement.dif_correction_factor)
-
-# # Límites físicos y extremadamente raros
-# ghi = file_df.loc[:, ["fecha", "IRGLO", "solartime"]]
-# dhi = file_df.loc[:, ["fecha", "IRDIF", "solartime"]]
-# factor_series = pd.Series(map(lambda gon_value, theta_z_value: gon_factor(gon_value, theta_z_value), gon_series,
-#                               zenith_angle_series_rad))
-# ghi["upper_physical_limit"] = 1.5 * factor_series + 100
-# ghi["upper_extreme_limit"] = 1.2 * factor_series + 50
-# dhi["upper_physical_limit"] = 0.95 * factor_series + 50
-# dhi["upper_extreme_limit"] = 0.75 * factor_series + 30
-# physical_lower_limit = -4
-# extreme_lower_limit = -2
-# ghi.index = ghi.fecha
-# dhi.index = dhi.fecha
+# Límites físicos, extremadamente raros y razón de difusa (máscara de bits por fila, ver qcontrol.qcontrol)
+file_df["QC"] = qc_flags(file_df["IRGLO"], file_df["IRDIF"], geometry.zenithal_angle, geometry.gon)
+file_df.to_csv("2022-minute-dif_corrected.csv")
 
 # Fin del programa: se ejecuta parte final para conteo de corrida
 toc = datetime.now()
@@ -0,0 +1,218 @@
+import json
+import os
+import struct
+import numpy as np
+from lebaron.astronomy import to_datetime64
+from lebaron.reader import StationBlock, read_station_csv
+
+MAGIC = b"LBARCH01"
+HEADER_ALIGNMENT = 64
+
+
+class StationArchive:
+    """
+    Append-only binary archive of the raw GHI and DIF of one station: a small JSON header followed by fixed size
+    records of int64 epoch minutes and the irradiance columns, memory-mapped for reading. On a regular grid the row
+    of a timestamp is computed in O(1) and checked against the stored minute, with a binary search over the
+    mapped minutes when the grid has gaps, so reading a range only touches the pages of that range.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            magic, length = struct.unpack("<8sI", file.read(12))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a station archive")
+            header = json.loads(file.read(length))
+        self.dtype = header["dtype"]
+        self.step_minutes = header["step_minutes"]
+        self.record = np.dtype([("minute", "<i8"), ("glo_h", self.dtype), ("dif_hu", self.dtype)])
+        self.offset = _header_size(length)
+        self._records = None
+
+    @classmethod
+    def create(cls, path, dtype="float32", step_minutes=1):
+        """
+        Creates an empty archive
+
+        Parameters
+        ----------
+        path : str
+            archive file, overwritten
+        dtype : str
+            dtype of the irradiance columns, float32 (enough for 0.1 W/m2) or float64
+        step_minutes : int
+            nominal minutes between records, used to locate timestamps in O(1)
+
+        Returns
+        -------
+        archive : StationArchive
+        """
+        header = json.dumps(dict(dtype=np.dtype(dtype).str, step_minutes=step_minutes)).encode()
+        with open(path, "wb") as file:
+            file.write(struct.pack("<8sI", MAGIC, len(header)) + header)
+            file.write(b"\0" * (_header_size(len(header)) - 12 - len(header)))
+        return cls(path)
+
+    def __len__(self):
+        return max(os.path.getsize(self.path) - self.offset, 0) // self.record.itemsize
+
+    @property
+    def records(self):
+        """
+        Read only memory map of the records, remapped after appends
+        """
+        rows = len(self)
+        if self._records is None or len(self._records) != rows:
+            self._records = np.memmap(self.path, dtype=self.record, mode="r", offset=self.offset, shape=(rows,)) \
+                if rows else np.empty(0, dtype=self.record)
+        return self._records
+
+    def append(self, dates, glo_h, dif_hu, duplicates="first"):
+        """
+        Appends measurements after the last record
+
+        Parameters
+        ----------
+        dates : array-like
+            timestamps on whole minutes, increasing and later than the last record
+        glo_h, dif_hu : array-like
+            global and diffuse irradiance
+        duplicates : str
+            "first" drops measurements whose minute repeats the previous one or is already in the archive, keeping
+            the first as qcontrol.integrity.reindex_to_grid() does, "raise" rejects them
+
+        Returns
+        -------
+        rows : int
+            records appended
+        """
+        if duplicates not in ("first", "raise"):
+            raise ValueError(f"unknown duplicates policy '{duplicates}'")
+        minutes = _epoch_minutes(dates)
+        records = np.empty(len(minutes), dtype=self.record)
+        records["minute"] = minutes
+        records["glo_h"] = glo_h
+        records["dif_hu"] = dif_hu
+        stored = self.records["minute"]
+        if duplicates == "first" and len(minutes):
+            keep = np.ones(len(minutes), dtype=bool)
+            keep[1:] = minutes[1:] != minutes[:-1]
+            old = minutes <= stored[-1] if len(stored) else np.zeros(len(minutes), dtype=bool)
+            position = np.minimum(np.searchsorted(stored, minutes[old]), len(stored) - 1)
+            keep[old] &= stored[position] != minutes[old]
+            records = records[keep]
+            minutes = records["minute"]
+        if np.any(np.diff(minutes) <= 0) or (len(stored) and len(minutes) and minutes[0] <= stored[-1]):
+            raise ValueError("archive records must be strictly increasing in time")
+        with open(self.path, "ab") as file:
+            file.write(records.tobytes())
+        return len(records)
+
+    def locate(self, date, side="left"):
+        """
+        Row of the first record at or after date (side="left") or after date (side="right")
+
+        Parameters
+        ----------
+        date : datetime-like
+            timestamp
+        side : str
+            "left" or "right", as in numpy.searchsorted()
+
+        Returns
+        -------
+        row : int
+            0 to len(self)
+        """
+        minutes = self.records["minute"]
+        if len(minutes) == 0:
+            return 0
+        date = to_datetime64([date])[0]
+        floor = date.astype("datetime64[m]")
+        minute = int(floor.astype(np.int64)) + (side == "right" or floor != date)  # First minute searched for
+        row = min(max(-(-(minute - int(minutes[0])) // self.step_minutes), 0), len(minutes))
+        # Grid guess, checked on the two records around it
+        if (row == len(minutes) or minutes[row] >= minute) and (row == 0 or minutes[row - 1] < minute):
+            return row
+        return int(np.searchsorted(minutes, minute, side="left"))
+
+    def read(self, start=None, end=None):
+        """
+        Records with start <= date < end, read from the mapped pages of that range only
+
+        Parameters
+        ----------
+        start, end : datetime-like, optional
+            range of dates, the whole archive by default
+
+        Returns
+        -------
+        block : lebaron.reader.StationBlock
+            dates as datetime64[ns], GHI and DIF as float64
+        """
+        first = 0 if start is None else self.locate(start)
+        last = len(self) if end is None else self.locate(end)
+        return _station_block(self.records[first:max(first, last)])
+
+    def blocks(self, start=None, end=None, chunk_rows=44640):
+        """
+        Streams a range of records in blocks, as lebaron.reader.read_station_csv() does, for
+        lebaron.pipeline.correct_blocks()
+
+        Returns
+        -------
+        blocks : generator of lebaron.reader.StationBlock
+        """
+        first = 0 if start is None else self.locate(start)
+        last = len(self) if end is None else self.locate(end)
+        for row in range(first, last, chunk_rows):
+            yield _station_block(self.records[row:min(row + chunk_rows, last)])
+
+
+def import_station_csv(csv_path, archive_path, dtype="float32", step_minutes=1, duplicates="first", **read_options):
+    """
+    Converts a station CSV file into a new archive, block by block. Repeated timestamps keep their first
+    measurement by default, also across blocks.
+
+    Parameters
+    ----------
+    csv_path : str
+        station file, read with lebaron.reader.read_station_csv()
+    archive_path : str
+        archive file, overwritten
+    dtype : str
+        dtype of the irradiance columns
+    step_minutes : int
+        nominal minutes between records
+    duplicates : str
+        "first" or "raise", as in StationArchive.append()
+    read_options
+        keyword arguments of read_station_csv()
+
+    Returns
+    -------
+    archive : StationArchive
+    """
+    archive = StationArchive.create(archive_path, dtype=dtype, step_minutes=step_minutes)
+    for block in read_station_csv(csv_path, **read_options):
+        archive.append(*block, duplicates=duplicates)
+    return archive
+
+
+def _station_block(records):
+    # Copies the mapped records into regular arrays
+    return StationBlock(np.asarray(records["minute"]).astype("datetime64[m]").astype("datetime64[ns]"),
+                        np.array(records["glo_h"], dtype=np.float64), np.array(records["dif_hu"], dtype=np.float64))
+
+
+def _epoch_minutes(dates):
+    dates = to_datetime64(dates)
+    minutes = dates.astype("datetime64[m]")
+    if np.any(np.isnat(dates)) or np.any(minutes != dates):
+        raise ValueError("archive timestamps must be valid whole minutes")
+    return minutes.astype(np.int64)
+
+
+def _header_size(length):
+    return -(-(12 + length) // HEADER_ALIGNMENT) * HEADER_ALIGNMENT
@@ -0,0 +1,311 @@
+import numpy as np
+import solarpy as sp
+from lebaron.lebaron import lng_to360
+
+
+def to_datetime64(dates):
+    """
+    Converts timestamps to a datetime64[ns] array. Time zone aware DatetimeIndex, Series or Timestamp keep their
+    wall clock time, as SolarMeasurement does with datetime fields, instead of being converted to UTC.
+
+    Parameters
+    ----------
+    dates : array-like
+        DatetimeIndex, Series, datetime64 array or sequence of datetime objects
+
+    Returns
+    -------
+    dates : numpy array
+        datetime64[ns] array
+    """
+    accessor = getattr(dates, "dt", dates)
+    if getattr(accessor, "tz", None) is not None:
+        dates = accessor.tz_localize(None)
+    return np.asarray(dates, dtype="datetime64[ns]").ravel()
+
+
+def daily_index(dates):
+    """
+    Days spanned by the timestamps, so that terms depending only on the day are evaluated once per day and broadcast
+
+    Parameters
+    ----------
+    dates : array-like
+        timestamps, NaT allowed
+
+    Returns
+    -------
+    index : int array
+        position of each timestamp's day in days (0 for NaT)
+    days : datetime64[D] array
+        every day from the first to the last timestamp
+    """
+    dates = to_datetime64(dates).astype("datetime64[D]")
+    valid = ~np.isnat(dates)
+    if not valid.any():
+        return np.zeros(len(dates), dtype=np.int64), np.array([], dtype="datetime64[D]")
+    first = dates[valid].min()
+    days = np.arange(first, dates[valid].max() + np.timedelta64(1, "D"))
+    return np.where(valid, (dates - first).astype(np.int64), 0), days
+
+
+def day_of_the_year(dates):
+    """
+    Array version of solarpy.utils.day_of_the_year()
+
+    Parameters
+    ----------
+    dates : datetime64 array
+        dates of interest
+
+    Returns
+    -------
+    day : int array
+        day of the year (1 to 366)
+    """
+    dates = to_datetime64(dates)
+    years = dates.astype("datetime64[Y]").astype("datetime64[D]")
+    return (dates.astype("datetime64[D]") - years).astype(np.int64) + 1
+
+
+def b_nday(day):
+    """
+    Array version of solarpy.b_nday(), taking the day of the year
+
+    Parameters
+    ----------
+    day : int array
+        day of the year
+
+    Returns
+    -------
+    B : float array
+        angle of the day of the year in radians
+    """
+    return np.deg2rad((day - 1) * (360 / 365))
+
+
+def gon(day):
+    """
+    Array version of solarpy.gon(), taking the day of the year
+
+    Parameters
+    ----------
+    day : int array
+        day of the year
+
+    Returns
+    -------
+    gon : float array
+        extraterrestrial radiation in W/m2
+    """
+    b = b_nday(day)
+    return 1367 * (1.00011 + 0.034221 * np.cos(b) +
+                   0.00128 * np.sin(b) + 0.000719 * np.cos(2 * b) +
+                   0.000077 * np.sin(2 * b))
+
+
+def eq_time(day):
+    """
+    Array version of solarpy.eq_time(), taking the day of the year
+
+    Parameters
+    ----------
+    day : int array
+        day of the year
+
+    Returns
+    -------
+    E : float array
+        equation of time in minutes
+    """
+    b = b_nday(day)
+    return 229.2 * (0.000075 + 0.001868 * np.cos(b) -
+                    0.032077 * np.sin(b) - 0.014615 * np.cos(2 * b) -
+                    0.04089 * np.sin(2 * b))
+
+
+def declination(day):
+    """
+    Array version of solarpy.declination(), taking the day of the year
+
+    Parameters
+    ----------
+    day : int array
+        day of the year
+
+    Returns
+    -------
+    declination : float array
+        declination in radians
+    """
+    b = b_nday(day)
+    return 0.006918 - 0.399912 * np.cos(b) + 0.070257 * np.sin(b) - \
+        0.006758 * np.cos(2 * b) + 0.000907 * np.sin(2 * b) - \
+        0.002679 * np.cos(3 * b) + 0.00148 * np.sin(3 * b)
+
+
+def standard2solar_time(dates, lng, lng_std):
+    """
+    Array version of lebaron.lebaron.standard2solar_time_modified(). The equation of time is evaluated once per day
+    and broadcast, and each shift is rounded to microseconds as timedelta does.
+
+    Parameters
+    ----------
+    dates : array-like
+        standard (or local) times, as a DatetimeIndex, Series or datetime64 array
+    lng : float
+        longitude
+    lng_std: float
+        standard longitude
+
+    Returns
+    -------
+    solar time : datetime64[ns] array
+        solar time, NaT where dates is NaT
+    """
+    sp.check_long(lng)
+    dates = to_datetime64(dates)
+    index, days = daily_index(dates)
+    delta_std_meridian = np.round(4 * (lng_to360(lng_std) - lng_to360(lng)) * 60 * 1e6)
+    e_param = np.round(eq_time(day_of_the_year(days)) * 60 * 1e6)
+    shift = (delta_std_meridian + e_param).astype(np.int64).astype("timedelta64[us]")
+    if len(days) == 0:
+        return dates
+    return dates + shift[index]
+
+
+def hour_angle(dates):
+    """
+    Array version of solarpy.hour_angle(). As in solarpy, seconds are ignored.
+
+    Parameters
+    ----------
+    dates : datetime64 array
+        date and *solar* time
+
+    Returns
+    -------
+    hour angle : float array
+        local hour angle in radians
+    """
+    dates = to_datetime64(dates)
+    minute_of_day = (dates - dates.astype("datetime64[D]")) // np.timedelta64(1, "m")
+    hour, minute = np.divmod(minute_of_day, 60)
+    return np.deg2rad((hour + (minute / 60) - 12) * 15)
+
+
+def theta_z(dates, lat):
+    """
+    Array version of solarpy.theta_z()
+
+    Parameters
+    ----------
+    dates : datetime64 array
+        date and *solar* time
+    lat : float
+        latitude (-90 to 90) in degrees
+
+    Returns
+    -------
+    theta_z : float array
+        zenith angle of incidence in radians
+    """
+    index, days = daily_index(dates)
+    dec = declination(day_of_the_year(days))[index]
+    lat = np.deg2rad(lat)
+    w = hour_angle(dates)
+    cos_theta_z = np.sin(dec) * np.sin(lat) + np.cos(dec) * np.cos(lat) * np.cos(w)
+    return np.arccos(cos_theta_z)
+
+
+def sunset_hour_angle(day, lat):
+    """
+    Array version of solarpy.sunset_hour_angle(), taking the day of the year. Days without sunset or sunrise are NaN
+    instead of raising solarpy.NoSunsetNoSunrise.
+
+    Parameters
+    ----------
+    day : int array
+        day of the year
+    lat : float
+        latitude (-90 to 90) in degrees
+
+    Returns
+    -------
+    sunset_hour_angle : float array
+        hour angle at sunset in radians
+    """
+    dec = declination(day)
+    lat = np.deg2rad(lat)
+    cos_ws = (-1) * np.tan(lat) * np.tan(dec)
+    with np.errstate(invalid="ignore"):
+        return np.where(np.abs(cos_ws) > 1, np.nan, np.arccos(cos_ws))
+
+
+def sunset_time(dates, ws):
+    """
+    Array version of solarpy.sunset_time(), truncated to the minute as solarpy does
+
+    Parameters
+    ----------
+    dates : datetime64 array
+        date (indifferent time)
+    ws : float array
+        sunset hour angle in radians for each date
+
+    Returns
+    -------
+    sunset_time : datetime64 array
+        *solar* time at sunset, NaT when there is no sunset
+    """
+    return _hour_angle_time(dates, ws)
+
+
+def sunrise_time(dates, ws):
+    """
+    Array version of solarpy.sunrise_time(), truncated to the minute as solarpy does
+
+    Parameters
+    ----------
+    dates : datetime64 array
+        date (indifferent time)
+    ws : float array
+        sunset hour angle in radians for each date
+
+    Returns
+    -------
+    sunrise_time : datetime64 array
+        *solar* time at sunrise, NaT when there is no sunrise
+    """
+    return _hour_angle_time(dates, -ws)
+
+
+def _hour_angle_time(dates, w):
+    aux = (np.rad2deg(w) / 15) * 60 * 60  # seconds
+    minutes = np.floor_divide(aux, 60)
+    midnight = to_datetime64(dates).astype("datetime64[D]").astype("datetime64[ns]")
+    offset = np.where(np.isnan(minutes), np.timedelta64("NaT"),
+                      (12 * 60 + np.nan_to_num(minutes)).astype(np.int64).astype("timedelta64[m]"))
+    return midnight + offset
+
+
+def air_mass_kastenyoung1989(theta_z, h):
+    """
+    Array version of solarpy.air_mass_kastenyoung1989(), saturated at 91.5º as solarpy does
+
+    Parameters
+    ----------
+    theta_z : float array
+        zenith angle of incidence in degrees
+    h : float
+        altitude above sea level in meters
+
+    Returns
+    -------
+    m : float array
+        ratio
+    """
+    theta_z = np.where(theta_z < 91.5, theta_z, 91.5)
+    theta_z_rad = np.deg2rad(theta_z)
+    return np.exp(-0.0001184 * h) / (np.cos(theta_z_rad) + 0.50572 * (96.07995 - theta_z) ** (-1.634))
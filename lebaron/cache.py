@@ -0,0 +1,87 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import NamedTuple
+import solarpy as sp
+from lebaron.lebaron import c_i_original
+
+
+class DailyGeometry(NamedTuple):
+    declination: float  # In radians
+    sunrise: object  # datetime, solar time as returned by solarpy
+    sunset: object
+    sunset_hour_angle: float  # In radians
+    c_i: float
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class DailyGeometryCache:
+    """
+    Bounded least recently used cache of the geometry that only changes once per day for a site: declination,
+    sunrise, sunset, sunset hour angle and C_i. Keyed on date, latitude and shadowband width and radius.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, date, lat, shadowband_width, shadowband_radius):
+        """
+        Daily geometry for the day of date, computed with solarpy on the first request
+
+        Parameters
+        ----------
+        date : datetime object
+            date (indifferent time)
+        lat : float
+            latitude (-90 to 90) in degrees
+        shadowband_width : float
+            shadowband width
+        shadowband_radius : float
+            shadowband radius, in the same units as the width
+
+        Returns
+        -------
+        geometry : DailyGeometry
+            daily geometry of that day and site
+        """
+        key = (date.date(), lat, shadowband_width, shadowband_radius)
+        with self._lock:
+            geometry = self._entries.get(key)
+            if geometry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return geometry
+            self.misses += 1
+        geometry = DailyGeometry(sp.declination(date), sp.sunrise_time(date, lat), sp.sunset_time(date, lat),
+                                 sp.sunset_hour_angle(date, lat),
+                                 c_i_original(date, lat, shadowband_width, shadowband_radius))
+        with self._lock:
+            self._entries[key] = geometry
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return geometry
+
+    def cache_info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+# Cache shared by every SolarMeasurement
+daily_geometry_cache = DailyGeometryCache()
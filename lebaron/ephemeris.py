@@ -0,0 +1,95 @@
+import numpy as np
+from lebaron.astronomy import daily_index, to_datetime64
+from lebaron.instrumentation import stage
+from lebaron.vectorized import SolarGeometry, solar_geometry
+
+SITE_PARAMETERS = ("lat", "lng", "lng_std", "altitude", "shadowband_width", "shadowband_radius")
+DAILY_FIELDS = ("eq_time", "gon", "c_i")  # SolarGeometry fields depending only on the day, stored once per day
+
+
+class Ephemeris:
+    """
+    Solar geometry of one site on a regular time grid, built once and persisted to a compressed .npz file so that
+    reprocessing the site's measurements skips all astronomy. Measurements are aligned to the grid by their
+    timestamp. Zenith angle, air mass and daylight are kept per grid row and the DAILY_FIELDS per day, expanded by
+    take().
+    """
+
+    def __init__(self, start, step, site, geometry):
+        self.start = np.datetime64(start, "ns")
+        self.step = np.timedelta64(step, "ns")
+        self.site = tuple(float(value) for value in site)  # Ordered as SITE_PARAMETERS
+        self.geometry = geometry  # SolarGeometry, DAILY_FIELDS with one value per day from the start
+
+    def __len__(self):
+        return len(self.geometry.zenithal_angle)
+
+    @classmethod
+    def build(cls, year, lat, lng, lng_std, altitude, shadowband_width, shadowband_radius, step_minutes=1):
+        """
+        Ephemeris of a whole year for a site
+
+        Parameters
+        ----------
+        year : int
+            year of the ephemeris, from January 1st 00:00 to December 31st 23:59 standard time
+        lat, lng, lng_std, altitude, shadowband_width, shadowband_radius : float
+            site and shadowband parameters, as in lebaron.vectorized.dif_correction()
+        step_minutes : int
+            resolution of the grid in minutes
+
+        Returns
+        -------
+        ephemeris : Ephemeris
+            ephemeris of that site and year
+        """
+        site = (lat, lng, lng_std, altitude, shadowband_width, shadowband_radius)
+        start = np.datetime64(f"{year:04d}-01-01", "ns")
+        step = np.timedelta64(step_minutes, "m").astype("timedelta64[ns]")
+        dates = np.arange(start, np.datetime64(f"{year + 1:04d}-01-01", "ns"), step)
+        geometry = solar_geometry(dates, *site)
+        index, _ = daily_index(dates)
+        first_rows = np.flatnonzero(np.diff(index, prepend=-1))
+        return cls(start, step, site, geometry._replace(**{field: getattr(geometry, field)[first_rows]
+                                                           for field in DAILY_FIELDS}))
+
+    def save(self, path):
+        np.savez_compressed(path, start=self.start, step=self.step, site=np.array(self.site),
+                            **self.geometry._asdict())
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            geometry = SolarGeometry(*(data[field] for field in SolarGeometry._fields))
+            return cls(data["start"], data["step"], data["site"], geometry)
+
+    def locate(self, dates):
+        """
+        Row of the grid of each timestamp
+
+        Parameters
+        ----------
+        dates : array-like
+            standard (or local) times
+
+        Returns
+        -------
+        rows : int array
+            row of each timestamp. Raises ValueError if any of them is off the grid or outside the ephemeris
+        """
+        offset = to_datetime64(dates) - self.start
+        rows, remainder = np.divmod(offset.astype(np.int64), self.step.astype(np.int64))
+        if np.any(remainder != 0) or np.any(rows < 0) or np.any(rows >= len(self)):
+            raise ValueError("timestamps outside the ephemeris grid")
+        return rows
+
+    def take(self, dates):
+        """
+        Geometry of each timestamp, as returned by lebaron.vectorized.solar_geometry()
+        """
+        with stage("ephemeris", len(dates)):
+            rows = self.locate(dates)
+            first_day = self.start.astype("datetime64[D]")
+            days = ((self.start + rows * self.step).astype("datetime64[D]") - first_day).astype(np.int64)
+            return SolarGeometry(*(column[days if field in DAILY_FIELDS else rows]
+                                   for field, column in self.geometry._asdict().items()))
@@ -0,0 +1,174 @@
+import io
+import json
+import os
+import time
+from typing import NamedTuple
+import numpy as np
+from lebaron.pipeline import correct_blocks, write_csv
+from lebaron.reader import DATE_FORMAT, read_station_csv
+from lebaron.table import LEBARON_TABLE
+
+
+class Watermark(NamedTuple):
+    last_timestamp: str  # ISO timestamp of the last processed row, None before the first update
+    offset: int  # Bytes of the input file already read, always at the start of a line
+    header: str  # Header line of the input file, prepended to each tail
+    first_line: str = None  # First data line of the input file, None until it is complete
+    input_path: str = None  # Absolute path of the input file
+
+
+class UpdateReport(NamedTuple):
+    rows: int  # New rows corrected and appended
+    skipped: int  # Rows of the tail at or before the watermark, not processed again
+    seconds: float
+    watermark: Watermark  # Watermark after the update
+
+
+def load_watermarks(path):
+    """
+    Reads the watermarks of every station from a JSON state file
+
+    Parameters
+    ----------
+    path : str
+        state file, missing before the first update
+
+    Returns
+    -------
+    watermarks : dict
+        Watermark of each station name
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        return {station: Watermark(**watermark) for station, watermark in json.load(file).items()}
+
+
+def save_watermarks(path, watermarks):
+    """
+    Writes the watermarks of every station to a JSON state file, replacing it atomically so that a crash never
+    leaves a truncated state
+
+    Parameters
+    ----------
+    path : str
+        state file
+    watermarks : dict
+        Watermark of each station name
+    """
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as file:
+        json.dump({station: watermark._asdict() for station, watermark in watermarks.items()}, file, indent=1)
+    os.replace(temporary, path)
+
+
+def read_tail(input_path, watermark=None, date_column="fecha", glo_column="IRGLO", dif_column="IRDIF", sep=";",
+              date_format=DATE_FORMAT):
+    """
+    Reads the complete lines appended to a station file since the watermark, seeking to its byte offset. A partial
+    last line being written by the datalogger is left for the next read. If the file shrank or no longer starts with
+    the header and first data line of the watermark (rotated or rewritten), it is read again from the start, and the
+    timestamp watermark still drops the rows already processed.
+
+    Parameters
+    ----------
+    input_path : str
+        station file, as read by lebaron.reader.read_station_csv()
+    watermark : Watermark, optional
+        watermark of the station, None to read the whole file
+    date_column, glo_column, dif_column, sep, date_format
+        as in lebaron.reader.read_station_csv()
+
+    Returns
+    -------
+    block : lebaron.reader.StationBlock
+        new rows after the watermark timestamp, None if there are none
+    skipped : int
+        rows of the tail at or before the watermark timestamp
+    watermark : Watermark
+        watermark after these rows
+    """
+    last_timestamp, offset, header, first_line, _ = watermark if watermark is not None else (None, 0, None, None, None)
+    with open(input_path, "rb") as file:
+        head = file.readline(), file.readline()
+        if header is not None and (offset > os.fstat(file.fileno()).st_size or head[0].decode() != header or
+                                   first_line is not None and head[1].decode() != first_line):
+            offset, header, first_line = 0, None, None
+        file.seek(offset)
+        data = file.read()
+    data = data[:data.rfind(b"\n") + 1]
+    if header is None and data:
+        header_end = data.find(b"\n") + 1
+        header, data, offset = data[:header_end].decode(), data[header_end:], offset + header_end
+    if first_line is None and head[1].endswith(b"\n"):
+        first_line = head[1].decode()
+    watermark = Watermark(last_timestamp, offset + len(data), header, first_line, os.path.abspath(input_path))
+    if not data:
+        return None, 0, watermark
+    blocks = list(read_station_csv(io.BytesIO(header.encode() + data), chunk_rows=data.count(b"\n"),
+                                   date_column=date_column, glo_column=glo_column, dif_column=dif_column, sep=sep,
+                                   date_format=date_format))
+    if not blocks:
+        return None, 0, watermark
+    block = blocks[0]
+    new = np.ones(len(block.dates), dtype=bool) if last_timestamp is None else \
+        block.dates > np.datetime64(last_timestamp, "ns")
+    if not new.any():
+        return None, len(new), watermark
+    block = type(block)(*(column[new] for column in block))
+    return block, int((~new).sum()), watermark._replace(last_timestamp=str(block.dates.max()))
+
+
+def update_station(input_path, output_path, state_path, lat, lng, lng_std, altitude, shadowband_width,
+                   shadowband_radius, station=None, table=LEBARON_TABLE, ephemeris=None):
+    """
+    Incremental counterpart of lebaron.pipeline.correct_station_file() for live stations: reads only the lines
+    appended since the last update, corrects and QC flags them and appends them to the output CSV, then moves the
+    station watermark forward. The cost of an update is proportional to the new rows, not to the file size, and the
+    per day terms are evaluated for the days of those rows only (or taken from ephemeris).
+
+    Parameters
+    ----------
+    input_path : str
+        station file being appended to
+    output_path : str
+        corrected CSV file, appended to
+    state_path : str
+        JSON file keeping the watermark of each station, see load_watermarks()
+    lat, lng, lng_std, altitude, shadowband_width, shadowband_radius : float
+        site and shadowband parameters, as in lebaron.vectorized.dif_correction()
+    station : str, optional
+        key of the watermark, the input file name without extension by default. Raises ValueError if the state
+        file holds the watermark of another input file under that key, as same-named files of two stations would
+    table : array-like
+        4x4x4x4 table of LeBaron correction factors
+    ephemeris : lebaron.ephemeris.Ephemeris, optional
+        precomputed geometry of this site
+
+    Returns
+    -------
+    report : UpdateReport
+        rows appended and skipped, wall time and the new watermark
+
+    Notes
+    -----
+    The watermark is saved after the rows are written, so a crash in between processes those rows again on the next
+    update instead of losing them.
+    """
+    start = time.perf_counter()
+    station = os.path.splitext(os.path.basename(input_path))[0] if station is None else station
+    watermarks = load_watermarks(state_path)
+    previous = watermarks.get(station)
+    if previous is not None and previous.input_path not in (None, os.path.abspath(input_path)):
+        raise ValueError(f"station '{station}' already has the watermark of {previous.input_path}, give the stations "
+                         f"distinct names")
+    block, skipped, watermark = read_tail(input_path, previous)
+    rows = 0
+    if block is not None:
+        blocks = correct_blocks([block], lat, lng, lng_std, altitude, shadowband_width, shadowband_radius,
+                                table=table, ephemeris=ephemeris)
+        rows = sum(len(corrected.dates) for corrected in write_csv(blocks, output_path, append=True))
+    if watermark != previous:
+        watermarks[station] = watermark
+        save_watermarks(state_path, watermarks)
+    return UpdateReport(rows, skipped, time.perf_counter() - start, watermark)
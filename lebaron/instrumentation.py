@@ -0,0 +1,189 @@
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import NamedTuple
+import numpy as np
+from lebaron.cache import daily_geometry_cache
+
+
+class StageReport(NamedTuple):
+    stage: str
+    calls: int
+    rows: int
+    seconds: float  # Wall time summed over calls, threads overlap
+    nan_count: int  # NaN in the main output of the stage, NaN GHI for read_csv and qc_flags
+    days: int  # Days whose day only terms (declination, equation of time, sunrise, C_i...) were evaluated
+
+
+class InstrumentationReport(NamedTuple):
+    stages: tuple  # StageReport of each stage, in order of first use
+    seconds: float  # Wall time since instrumentation was enabled
+    days: int  # Days whose day only terms were evaluated, summed over stages
+    cache_hits: int  # Daily geometry cache hits and misses of SolarMeasurement since instrumentation was enabled
+    cache_misses: int
+
+
+class Instrumentation:
+    """
+    Accumulates per stage wall time, rows and NaN counts of the lebaron and qcontrol entry points while enabled with
+    instrumented(), optionally writing one JSON line per stage call to a sink
+    """
+
+    def __init__(self, sink=None):
+        self.sink = sink  # File-like object, or None
+        self._stages = {}
+        self._lock = Lock()
+        self._start = time.perf_counter()
+        self._stop = None  # Set when instrumented() exits
+        self._cache_start = daily_geometry_cache.cache_info()
+        self._cache_stop = None
+
+    def record(self, stage, rows, seconds, nan_count=0, days=0):
+        with self._lock:
+            totals = self._stages.setdefault(stage, [0, 0, 0.0, 0, 0])
+            totals[0] += 1
+            totals[1] += rows
+            totals[2] += seconds
+            totals[3] += nan_count
+            totals[4] += days
+            if self.sink is not None:
+                self.sink.write(json.dumps(dict(stage=stage, rows=rows, seconds=seconds, nan_count=nan_count,
+                                                days=days, time=time.time())) + "\n")
+
+    def report(self):
+        """
+        Totals so far
+
+        Returns
+        -------
+        report : InstrumentationReport
+        """
+        cache = self._cache_stop or daily_geometry_cache.cache_info()
+        with self._lock:
+            stages = tuple(StageReport(stage, *totals) for stage, totals in self._stages.items())
+        return InstrumentationReport(stages, (self._stop or time.perf_counter()) - self._start,
+                                     sum(stage_report.days for stage_report in stages),
+                                     cache.hits - self._cache_start.hits, cache.misses - self._cache_start.misses)
+
+
+class _Stage:
+    __slots__ = ("instrumentation", "name", "rows", "nan_count", "days", "start", "discarded")
+
+    def __init__(self, instrumentation, name, rows):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.rows = rows
+        self.nan_count = 0
+        self.days = 0
+        self.discarded = False
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exception):
+        if not self.discarded:
+            self.instrumentation.record(self.name, self.rows, time.perf_counter() - self.start, self.nan_count,
+                                        self.days)
+
+    def add_rows(self, rows):
+        self.rows += rows
+
+    def add_days(self, days):
+        self.days += days
+
+    def count_nan(self, values):
+        self.nan_count += int(np.count_nonzero(np.isnan(values)))
+
+    def discard(self):
+        self.discarded = True
+
+
+class _DisabledStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        pass
+
+    def add_rows(self, rows):
+        pass
+
+    def add_days(self, days):
+        pass
+
+    def count_nan(self, values):
+        pass
+
+    def discard(self):
+        pass
+
+
+_DISABLED = _DisabledStage()
+# Instrumentation enabled by instrumented() in the current context, if any. Threads started in the block do not
+# inherit it unless they run in a copy of the context, as asyncio.to_thread() does
+_active = ContextVar("instrumentation", default=None)
+
+
+def stage(name, rows=0):
+    """
+    Context manager timing one call of a stage. Returns a shared no-op object when instrumentation is disabled, so an
+    entry point only pays for a context variable lookup.
+
+    Parameters
+    ----------
+    name : str
+        stage name
+    rows : int
+        rows processed by the call
+
+    Returns
+    -------
+    stage : context manager
+        its add_rows(rows) adds to the rows of the call, add_days(days) to the days whose day only terms were
+        evaluated, count_nan(values) adds the NaN in values to its NaN count and discard() leaves the call out of
+        the totals
+    """
+    instrumentation = _active.get()
+    if instrumentation is None:
+        return _DISABLED
+    return _Stage(instrumentation, name, rows)
+
+
+@contextmanager
+def instrumented(sink=None):
+    """
+    Enables instrumentation of the lebaron and qcontrol entry points within the block, for the current thread (or
+    asyncio task) only. Nested blocks report separately and restore the enclosing one on exit.
+
+    Parameters
+    ----------
+    sink : str or file-like, optional
+        JSON lines output, one line per stage call and a final report line. Paths are appended to
+
+    Returns
+    -------
+    instrumentation : Instrumentation
+        whose report() gives the totals, also after the block
+    """
+    file = open(sink, "a") if isinstance(sink, str) else sink
+    instrumentation = Instrumentation(file)
+    token = _active.set(instrumentation)
+    try:
+        yield instrumentation
+    finally:
+        _active.reset(token)
+        instrumentation._stop = time.perf_counter()
+        instrumentation._cache_stop = daily_geometry_cache.cache_info()
+        if file is not None:
+            report = instrumentation.report()
+            file.write(json.dumps(dict(report=[stage_report._asdict() for stage_report in report.stages],
+                                       seconds=report.seconds, days=report.days, cache_hits=report.cache_hits,
+                                       cache_misses=report.cache_misses, time=time.time())) + "\n")
+            instrumentation.sink = None
+            if file is not sink:
+                file.close()
@@ -0,0 +1,118 @@
+from typing import NamedTuple
+import numpy as np
+from lebaron.instrumentation import stage
+from lebaron.table import DELTA_EDGES, EPSILON_EDGES, GEOMETRIC_EDGES, LEBARON_TABLE, ZENITH_EDGES, lebaron_cuts, \
+    lebaron_factor
+
+try:
+    import numba
+except ImportError:  # Optional, the NumPy path is used without it
+    numba = None
+
+KERNEL = "numpy" if numba is None else "numba"  # Implementation used by fused_lebaron()
+
+# Edges as homogeneous float tuples, so that the compiled kernel sees them as constants
+_ZENITH_EDGES, _GEOMETRIC_EDGES, _EPSILON_EDGES, _DELTA_EDGES = (
+    tuple(float(edge) for edge in edges) for edges in (ZENITH_EDGES, GEOMETRIC_EDGES, EPSILON_EDGES, DELTA_EDGES))
+
+
+class FusedResult(NamedTuple):
+    zenith_cut: np.ndarray  # None unless the cuts were requested
+    geometric_cut: np.ndarray
+    epsilon_cut: np.ndarray
+    delta_cut: np.ndarray
+    dif_correction_factor: np.ndarray
+
+
+def fused_lebaron(geometry, glo_h, dif_hu, table=LEBARON_TABLE, cuts=False, kernel=None):
+    """
+    LeBaron correction factor of the measurements given their precomputed SolarGeometry, without keeping epsilon,
+    delta or the direct irradiance. With Numba installed each row goes through dir_nu, epsilon, delta, the four cuts
+    and the table lookup in one compiled loop, so GHI and DIF are read once and the factor written once. Without it
+    the same chain runs in NumPy, reusing its temporaries in place. Both give the factor of
+    lebaron.vectorized.lebaron_from_geometry().
+
+    Parameters
+    ----------
+    geometry : lebaron.vectorized.SolarGeometry
+        geometry of each measurement
+    glo_h : float array
+        global horizontal irradiance
+    dif_hu : float array
+        diffuse horizontal irradiance measured under the shadowband
+    table : array-like
+        4x4x4x4 table of LeBaron correction factors, LEBARON_TABLE by default
+    cuts : bool
+        also return the four cuts
+    kernel : str, optional
+        "numba" or "numpy", KERNEL by default
+
+    Returns
+    -------
+    result : FusedResult
+        correction factor, NaN where there is none, and the cuts (None unless requested)
+    """
+    kernel = KERNEL if kernel is None else kernel
+    table = np.asarray(table, dtype=np.float64)
+    if table.shape != (4, 4, 4, 4):
+        raise ValueError("LeBaron table must be 4x4x4x4")
+    glo_h = np.asarray(glo_h, dtype=np.float64).ravel()
+    dif_hu = np.asarray(dif_hu, dtype=np.float64).ravel()
+    if kernel not in ("numba", "numpy"):
+        raise ValueError(f"unknown kernel '{kernel}'")
+    if kernel == "numba" and numba is None:
+        raise ImportError("numba is required for the compiled kernel")
+    with stage(f"fused_lebaron_{kernel}", len(glo_h)) as timer:
+        if kernel == "numba":
+            factor = np.empty(len(glo_h))
+            cut_values = np.empty((4, len(glo_h) if cuts else 0))
+            _lebaron_kernel(glo_h, dif_hu, *(np.asarray(column, dtype=np.float64) for column in
+                                             (geometry.zenithal_angle, geometry.c_i, geometry.air_mass, geometry.gon)),
+                            np.asarray(geometry.daylight, dtype=np.bool_), table, factor, cut_values)
+        else:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                epsilon = np.subtract(glo_h, dif_hu)
+                epsilon /= np.cos(geometry.zenithal_angle)  # dir_nu
+                epsilon += dif_hu
+                epsilon /= dif_hu
+                epsilon[~np.asarray(geometry.daylight, dtype=bool)] = np.nan
+                delta = np.multiply(dif_hu, geometry.air_mass)
+                delta /= geometry.gon
+            cut_values = lebaron_cuts(np.rad2deg(geometry.zenithal_angle), geometry.c_i, epsilon, delta)
+            factor = lebaron_factor(*cut_values, table=table)
+        timer.count_nan(factor)
+    return FusedResult(*(cut_values if cuts else (None,) * 4), factor)
+
+
+def _cut(value, edges):
+    # Scalar lebaron.table.lebaron_cut(), NaN values fail both comparisons
+    if not (edges[0] <= value <= edges[4]):
+        return np.nan
+    return 1.0 + (value > edges[1]) + (value > edges[2]) + (value > edges[3])
+
+
+def _lebaron_kernel(glo_h, dif_hu, zenithal_angle, c_i, air_mass, gon, daylight, table, factor, cuts):
+    for row in range(len(glo_h)):
+        dir_nu = (glo_h[row] - dif_hu[row]) / np.cos(zenithal_angle[row])
+        epsilon = (dif_hu[row] + dir_nu) / dif_hu[row] if daylight[row] else np.nan
+        delta = dif_hu[row] * air_mass[row] / gon[row]
+        zenith_cut = _cut(zenithal_angle[row] * (180 / np.pi), _ZENITH_EDGES)
+        geometric_cut = _cut(c_i[row], _GEOMETRIC_EDGES)
+        epsilon_cut = _cut(epsilon, _EPSILON_EDGES)
+        delta_cut = _cut(delta, _DELTA_EDGES)
+        if np.isnan(zenith_cut + geometric_cut + epsilon_cut + delta_cut):
+            factor[row] = np.nan
+        else:
+            factor[row] = table[int(zenith_cut) - 1, int(geometric_cut) - 1, int(epsilon_cut) - 1,
+                                int(delta_cut) - 1]
+        if cuts.shape[1]:
+            cuts[0, row] = zenith_cut
+            cuts[1, row] = geometric_cut
+            cuts[2, row] = epsilon_cut
+            cuts[3, row] = delta_cut
+
+
+if numba is not None:
+    # error_model="numpy" divides by zero to inf/NaN instead of raising, as the NumPy path does
+    _cut = numba.njit(inline="always")(_cut)
+    _lebaron_kernel = numba.njit(nogil=True, cache=True, error_model="numpy")(_lebaron_kernel)
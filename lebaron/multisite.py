@@ -0,0 +1,162 @@
+from typing import NamedTuple
+import numpy as np
+import solarpy as sp
+from lebaron import astronomy
+from lebaron.instrumentation import stage
+from lebaron.kernel import fused_lebaron
+from lebaron.lebaron import lng_to360
+from lebaron.table import LEBARON_TABLE
+from lebaron.vectorized import SolarGeometry
+
+NANOS_PER_MINUTE = 60 * 10 ** 9
+NANOS_PER_DAY = 1440 * NANOS_PER_MINUTE
+
+
+class TimeTerms(NamedTuple):
+    dates: np.ndarray  # datetime64[ns] standard times
+    dated: np.ndarray  # False for NaT
+    index: np.ndarray  # Position of each timestamp's day in days
+    days: np.ndarray  # datetime64[D], every day from the first to the last timestamp
+    day: np.ndarray  # Day of the year of days
+    eq_time: np.ndarray  # Of each timestamp, in minutes
+    gon: np.ndarray  # Of each timestamp
+    e_param: np.ndarray  # Equation of time of days in microseconds, rounded as standard2solar_time() does
+    solar_days: np.ndarray  # int64 epoch days, days with one more on each side, which solar times can fall on
+    declination: np.ndarray  # Of solar_days in radians, those of days being [1:-1]
+    sin_declination: np.ndarray
+    cos_declination: np.ndarray
+    cos3_declination: np.ndarray
+    tan_declination: np.ndarray
+    cos_hour_angle: np.ndarray  # Of each minute of the day, seconds being ignored as in solarpy.hour_angle()
+
+
+def time_terms(dates):
+    """
+    Terms of the LeBaron correction that depend only on the timestamps, evaluated once for any number of stations
+    measuring on the same dates: the day of each timestamp, declination, equation of time, extraterrestrial
+    irradiance and the hour angle of every minute of the day
+
+    Parameters
+    ----------
+    dates : array-like
+        standard (or local) times, as a DatetimeIndex, Series or datetime64 array
+
+    Returns
+    -------
+    terms : TimeTerms
+    """
+    dates = astronomy.to_datetime64(dates)
+    with stage("time_terms", len(dates)) as timer:
+        index, days = astronomy.daily_index(dates)
+        timer.add_days(len(days))
+        day = astronomy.day_of_the_year(days)
+        eq_time = astronomy.eq_time(day)
+        e_param = np.round(eq_time * 60 * 1e6)
+        first = days[0].astype(np.int64) - 1 if len(days) else 0
+        solar_days = np.arange(first, first + len(days) + 2)
+        declination = astronomy.declination(astronomy.day_of_the_year(solar_days.astype("datetime64[D]")))
+        hour, minute = np.divmod(np.arange(1440), 60)
+        hour_angle = np.deg2rad((hour + (minute / 60) - 12) * 15)
+        cos_declination = np.cos(declination)
+        return TimeTerms(dates, ~np.isnat(dates), index, days, day, eq_time[index], astronomy.gon(day)[index], e_param,
+                         solar_days, declination, np.sin(declination), cos_declination, cos_declination ** 3,
+                         np.tan(declination), np.cos(hour_angle))
+
+
+def site_geometry(terms, lat, lng, lng_std, altitude, shadowband_width, shadowband_radius):
+    """
+    SolarGeometry of one site from the shared TimeTerms, computing only the site dependent terms: the solar time
+    shift, zenith angle, air mass, sunrise and sunset and C_i. Equals lebaron.vectorized.solar_geometry() of the
+    same dates and site, except for a NaN zenith angle at NaT.
+
+    Parameters
+    ----------
+    terms : TimeTerms
+        time only terms of the dates, see time_terms()
+    lat, lng, lng_std, altitude, shadowband_width, shadowband_radius : float
+        site and shadowband parameters, as in lebaron.vectorized.dif_correction()
+
+    Returns
+    -------
+    geometry : lebaron.vectorized.SolarGeometry
+        sharing the eq_time and gon arrays of terms
+    """
+    sp.check_lat(lat)
+    sp.check_long(lng)
+    sp.check_alt(altitude)
+    with stage("site_geometry", len(terms.dates)) as timer:
+        timer.add_days(len(terms.days))
+        # Solar time in integer nanoseconds, shifted by whole microseconds as in astronomy.standard2solar_time()
+        delta_std_meridian = np.round(4 * (lng_to360(lng_std) - lng_to360(lng)) * 60 * 1e6)
+        shift = (delta_std_meridian + terms.e_param).astype(np.int64) * 1000
+        if len(shift):  # NaT is placed on the first day, its zenith angle is NaN anyway
+            solar = np.where(terms.dated, terms.dates.view(np.int64), terms.solar_days[1] * NANOS_PER_DAY)
+            solar += shift[terms.index]
+        else:
+            solar = np.full(len(terms.dates), terms.solar_days[1] * NANOS_PER_DAY)
+        solar_day, nanos_of_day = np.divmod(solar, NANOS_PER_DAY)
+        solar_day -= terms.solar_days[0]
+        # cos(theta_z) = sin(dec) sin(lat) + cos(dec) cos(lat) cos(w), with both products taken per day
+        lat_rad = np.deg2rad(lat)
+        cos_theta_z = (terms.sin_declination * np.sin(lat_rad))[solar_day]
+        cos_theta_z += (terms.cos_declination * np.cos(lat_rad))[solar_day] * \
+            terms.cos_hour_angle[nanos_of_day // NANOS_PER_MINUTE]
+        zenithal_angle = np.arccos(cos_theta_z, out=cos_theta_z)
+        zenithal_angle[~terms.dated] = np.nan
+        air_mass = astronomy.air_mass_kastenyoung1989(np.rad2deg(zenithal_angle), altitude)
+
+        # Per day terms of the clock days, from the shared declination as in astronomy.sunset_hour_angle()
+        declination, cos_declination = terms.declination[1:-1], terms.cos_declination[1:-1]
+        cos_ws = (-1) * np.tan(lat_rad) * terms.tan_declination[1:-1]
+        with np.errstate(invalid="ignore"):
+            sunset_hour_angle = np.where(np.abs(cos_ws) > 1, np.nan, np.arccos(cos_ws))
+        sunrise = astronomy.sunrise_time(terms.days, sunset_hour_angle)[terms.index]
+        sunset = astronomy.sunset_time(terms.days, sunset_hour_angle)[terms.index]
+        c_i = 1 / (1 - (2 * shadowband_width) / (np.pi * shadowband_radius) *
+                   terms.cos3_declination[1:-1] *
+                   (np.sin(lat_rad) *
+                    np.sin(declination * sunset_hour_angle) +
+                    np.cos(lat_rad) * cos_declination * np.sin(sunset_hour_angle)))
+        return SolarGeometry(zenithal_angle, terms.eq_time, terms.gon, air_mass,
+                             (sunrise < terms.dates) & (terms.dates < sunset), c_i[terms.index])
+
+
+def dif_correction_factors(dates, glo_h, dif_hu, sites, table=LEBARON_TABLE, kernel=None):
+    """
+    LeBaron correction factors of many stations measuring on the same dates, as a stations x time matrix. The time
+    only terms are evaluated once and broadcast, so each station adds only its site dependent geometry and the
+    lebaron.kernel.fused_lebaron() pass over its measurements, one station at a time to keep memory at a few rows.
+
+    Parameters
+    ----------
+    dates : array-like
+        standard (or local) times shared by every station
+    glo_h : array-like
+        (stations, time) global horizontal irradiance
+    dif_hu : array-like
+        (stations, time) diffuse horizontal irradiance measured under the shadowband
+    sites : array-like
+        (stations, 6) lat, lng, lng_std, altitude, shadowband_width and shadowband_radius of each station, as in
+        lebaron.vectorized.dif_correction()
+    table : array-like
+        4x4x4x4 table of LeBaron correction factors, LEBARON_TABLE by default
+    kernel : str, optional
+        "numba" or "numpy", as in lebaron.kernel.fused_lebaron()
+
+    Returns
+    -------
+    dif_correction_factor : float array
+        (stations, time) correction factors, NaN where there is none. Each row equals the factor of
+        lebaron.vectorized.dif_correction() for that station
+    """
+    terms = time_terms(dates)
+    sites = np.asarray(sites, dtype=np.float64).reshape(-1, 6)
+    shape = (len(sites), len(terms.dates))
+    glo_h = np.broadcast_to(np.asarray(glo_h, dtype=np.float64), shape)
+    dif_hu = np.broadcast_to(np.asarray(dif_hu, dtype=np.float64), shape)
+    factors = np.empty(shape)
+    for station, site in enumerate(sites):
+        geometry = site_geometry(terms, *(float(value) for value in site))
+        factors[station] = fused_lebaron(geometry, glo_h[station], dif_hu[station], table=table,
+                                         kernel=kernel).dif_correction_factor
+    return factors
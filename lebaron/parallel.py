@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+import numpy as np
+from lebaron.astronomy import to_datetime64
+
+
+def day_blocks(dates, blocks):
+    """
+    Splits rows into at most blocks contiguous ranges of similar size, cutting only where the day changes so that the
+    per day terms of each range are evaluated once
+
+    Parameters
+    ----------
+    dates : array-like
+        timestamps, normally sorted
+    blocks : int
+        number of ranges wanted
+
+    Returns
+    -------
+    ranges : list of slice
+        contiguous [start, stop) row ranges covering every row in order
+    """
+    days = to_datetime64(dates).astype("datetime64[D]")
+    if len(days) == 0:
+        return [slice(0, 0)]
+    boundaries = np.flatnonzero(days[1:] != days[:-1]) + 1
+    targets = np.arange(1, blocks) * len(days) / blocks
+    # Nearest day boundary to each even split, dropping repeats when there are fewer days than blocks
+    cuts = boundaries[np.abs(boundaries[:, None] - targets[None, :]).argmin(axis=0)] if len(boundaries) else []
+    cuts = np.unique(np.r_[0, cuts, len(days)]).astype(np.int64)
+    return [slice(int(start), int(stop)) for start, stop in zip(cuts[:-1], cuts[1:])]
+
+
+def map_day_blocks(function, dates, columns, workers):
+    """
+    Applies function to day blocks of the rows in a thread pool. NumPy releases the GIL inside its heavy kernels, so
+    blocks are processed concurrently within one process.
+
+    Parameters
+    ----------
+    function : callable
+        called as function(*columns[block]) for each block, returning an array or a NamedTuple of arrays
+    dates : array-like
+        timestamps of the rows, used to cut blocks at day boundaries
+    columns : sequence of array-like
+        columns aligned with dates, dates themselves included when function needs them
+    workers : int
+        number of threads, one block per thread
+
+    Returns
+    -------
+    result : array or NamedTuple of arrays
+        results of the blocks concatenated in row order
+    """
+    ranges = day_blocks(dates, workers)
+    columns = [np.asarray(column) for column in columns]
+    if len(ranges) == 1:
+        return function(*columns)
+    # Each block runs in a copy of the caller's context, so that instrumentation enabled by the caller follows it
+    contexts = [copy_context() for _ in ranges]
+    with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+        results = list(executor.map(lambda context, rows: context.run(function, *(column[rows] for column in columns)),
+                                    contexts, ranges))
+    if isinstance(results[0], tuple):
+        return type(results[0])(*(np.concatenate(fields) for fields in zip(*results)))
+    return np.concatenate(results)
@@ -0,0 +1,371 @@
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+from lebaron.instrumentation import stage
+from lebaron.kernel import fused_lebaron
+from lebaron.parallel import map_day_blocks
+from lebaron.reader import read_station_csv
+from lebaron.table import LEBARON_TABLE
+from lebaron.vectorized import solar_geometry
+from qcontrol.qcontrol import qc_flags
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional, only needed for Parquet output
+    pa = None
+    pq = None
+
+# Arrow types of the columnar output. Irradiances and factors fit float32 (0.1 W/m2 and 0.001 resolution), cuts are
+# nullable int8
+PARQUET_TYPES = {"glo_h": "float32", "dif_hu": "float32", "dif_hu_corrected": "float32",
+                 "dif_correction_factor": "float32", "zenith_cut": "int8", "geometric_cut": "int8",
+                 "epsilon_cut": "int8", "delta_cut": "int8", "qc_flags": "uint16"}
+
+
+class CorrectedBlock(NamedTuple):
+    dates: np.ndarray
+    glo_h: np.ndarray
+    dif_hu: np.ndarray
+    dif_hu_corrected: np.ndarray  # Measured diffuse where there is no correction factor
+    dif_correction_factor: np.ndarray
+    zenith_cut: np.ndarray
+    geometric_cut: np.ndarray
+    epsilon_cut: np.ndarray
+    delta_cut: np.ndarray
+    qc_flags: np.ndarray  # qcontrol.qcontrol bitmask
+
+
+class StationJob(NamedTuple):
+    input_path: str
+    lat: float
+    lng: float
+    lng_std: float
+    altitude: float
+    shadowband_width: float
+    shadowband_radius: float
+    station: str = None  # Required for Parquet output; CSV outputs are named after the input file without it
+
+
+class JobResult(NamedTuple):
+    job: StationJob
+    output_path: str
+    report: "PipelineReport"  # None if the job failed
+    error: str  # None if the job succeeded
+
+
+class PipelineReport(NamedTuple):
+    rows: int
+    seconds: float
+    rows_per_second: float
+    peak_rss_mb: float  # NaN where the platform does not report it
+
+
+def correct_blocks(blocks, lat, lng, lng_std, altitude, shadowband_width, shadowband_radius, table=LEBARON_TABLE,
+                   ephemeris=None, workers=1):
+    """
+    QC and LeBaron correction stage: flags and corrects each StationBlock as it arrives
+
+    Parameters
+    ----------
+    blocks : iterable of lebaron.reader.StationBlock
+        measurements of one site
+    lat, lng, lng_std, altitude, shadowband_width, shadowband_radius : float
+        site and shadowband parameters, as in lebaron.vectorized.dif_correction()
+    table : array-like
+        4x4x4x4 table of LeBaron correction factors
+    ephemeris : lebaron.ephemeris.Ephemeris, optional
+        precomputed geometry of this site, used instead of computing it
+    workers : int
+        number of threads correcting day blocks of each StationBlock concurrently
+
+    Returns
+    -------
+    blocks : generator of CorrectedBlock
+    """
+    site = (lat, lng, lng_std, altitude, shadowband_width, shadowband_radius)
+    if ephemeris is not None and ephemeris.site != site:
+        raise ValueError("ephemeris was built for a different site")
+
+    def correct(dates, glo_h_block, dif_hu_block):
+        geometry = solar_geometry(dates, *site) if ephemeris is None else ephemeris.take(dates)
+        glo_h = np.asarray(glo_h_block, dtype=np.float64)
+        dif_hu = np.asarray(dif_hu_block, dtype=np.float64)
+        result = fused_lebaron(geometry, glo_h, dif_hu, table=table, cuts=True)
+        factor = result.dif_correction_factor
+        dif_hu_corrected = np.where(np.isnan(factor), dif_hu, factor * dif_hu)
+        return CorrectedBlock(dates, glo_h_block, dif_hu_block, dif_hu_corrected, factor, result.zenith_cut,
+                              result.geometric_cut, result.epsilon_cut, result.delta_cut,
+                              qc_flags(glo_h, dif_hu, geometry.zenithal_angle, geometry.gon))
+
+    for block in blocks:
+        yield map_day_blocks(correct, block.dates, block, workers)
+
+
+def write_csv(blocks, path, sep=";", append=False):
+    """
+    Incremental writer stage: appends each block to a CSV file as it arrives and passes it on
+
+    Parameters
+    ----------
+    blocks : iterable of CorrectedBlock
+        corrected blocks, written with their field names as columns
+    path : str
+        output file, overwritten unless append
+    sep : str
+        column delimiter
+    append : bool
+        append to the file instead, writing the header only if it is empty or missing
+
+    Returns
+    -------
+    blocks : generator of CorrectedBlock
+        the same blocks, once written
+    """
+    with open(path, "a" if append else "w", newline="") as file:
+        header = file.tell() == 0
+        for block in blocks:
+            with stage("write_csv", len(block.dates)):
+                pd.DataFrame(block._asdict()).to_csv(file, sep=sep, index=False, header=header)
+                file.flush()
+            header = False
+            yield block
+
+
+def write_parquet(blocks, root, station, part=0):
+    """
+    Columnar writer stage: appends each block to Parquet files partitioned by station and month, laid out as
+    root/station=<station>/month=<YYYY-MM>/part-<part>.parquet, and passes it on. Reading one month of one station
+    only touches that partition, see read_parquet_partition(). Requires pyarrow.
+
+    Parameters
+    ----------
+    blocks : iterable of CorrectedBlock
+        corrected blocks
+    root : str
+        output directory
+    station : str
+        station name
+    part : int
+        number of the files written in each partition. Files of the same station and part are overwritten, so
+        writers sharing a station, such as several station-years, need distinct parts
+
+    Returns
+    -------
+    blocks : generator of CorrectedBlock
+        the same blocks, once written
+    """
+    if pq is None:
+        raise ImportError("pyarrow is required for Parquet output")
+    schema = pa.schema([("dates", pa.timestamp("ms"))] + [(name, pa.type_for_alias(PARQUET_TYPES[name]))
+                                                          for name in CorrectedBlock._fields[1:]])
+    writers = {}
+    try:
+        for block in blocks:
+            with stage("write_parquet", len(block.dates)):
+                months = block.dates.astype("datetime64[M]")
+                boundaries = np.flatnonzero(months[1:] != months[:-1]) + 1
+                for start, stop in zip(np.r_[0, boundaries], np.r_[boundaries, len(months)]):
+                    month = str(months[start])
+                    if month not in writers:
+                        directory = os.path.join(root, f"station={station}", f"month={month}")
+                        os.makedirs(directory, exist_ok=True)
+                        writers[month] = pq.ParquetWriter(os.path.join(directory, f"part-{part}.parquet"), schema)
+                    columns = [pa.array(block.dates[start:stop].astype("datetime64[ms]"))]
+                    columns += [pa.array(np.asarray(getattr(block, name)[start:stop]),
+                                         from_pandas=True).cast(field.type)
+                                for name, field in zip(CorrectedBlock._fields[1:], list(schema)[1:])]
+                    writers[month].write_table(pa.Table.from_arrays(columns, schema=schema))
+            yield block
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+
+def read_parquet_partition(root, station, month):
+    """
+    Reads the partition of one station and month written by write_parquet()
+
+    Parameters
+    ----------
+    root : str
+        directory passed to write_parquet()
+    station : str
+        station name
+    month : str
+        month as YYYY-MM
+
+    Returns
+    -------
+    table : pandas DataFrame
+        rows of that station and month
+    """
+    if pq is None:
+        raise ImportError("pyarrow is required for Parquet output")
+    return pq.read_table(os.path.join(root, f"station={station}", f"month={month}")).to_pandas()
+
+
+def correct_station_file(input_path, output_path, lat, lng, lng_std, altitude, shadowband_width, shadowband_radius,
+                         chunk_rows=44640, table=LEBARON_TABLE, ephemeris=None, output_format="csv", station=None,
+                         workers=1, part=0):
+    """
+    Streaming read -> QC -> LeBaron -> write pipeline over a station file, chunk by chunk, so the whole file is never
+    resident and output starts flowing with the first chunk
+
+    Parameters
+    ----------
+    input_path : str
+        station file, as read by lebaron.reader.read_station_csv()
+    output_path : str
+        corrected CSV file, or root directory of the Parquet partitions
+    lat, lng, lng_std, altitude, shadowband_width, shadowband_radius : float
+        site and shadowband parameters, as in lebaron.vectorized.dif_correction()
+    chunk_rows : int
+        rows per chunk
+    table : array-like
+        4x4x4x4 table of LeBaron correction factors
+    ephemeris : lebaron.ephemeris.Ephemeris, optional
+        precomputed geometry of this site
+    output_format : str
+        "csv" for write_csv() or "parquet" for write_parquet()
+    station : str, optional
+        station name of the Parquet partitions, required for Parquet output
+    workers : int
+        number of threads correcting day blocks of each chunk concurrently, see correct_blocks()
+    part : int
+        Parquet part number, see write_parquet()
+
+    Returns
+    -------
+    report : PipelineReport
+        rows processed, wall time, throughput and peak resident memory of the process
+    """
+    if output_format == "parquet" and station is None:
+        raise ValueError("Parquet output requires an explicit station")
+    start = time.perf_counter()
+    blocks = read_station_csv(input_path, chunk_rows=chunk_rows)
+    blocks = correct_blocks(blocks, lat, lng, lng_std, altitude, shadowband_width, shadowband_radius, table=table,
+                            ephemeris=ephemeris, workers=workers)
+    if output_format == "csv":
+        blocks = write_csv(blocks, output_path)
+    elif output_format == "parquet":
+        blocks = write_parquet(blocks, output_path, station, part=part)
+    else:
+        raise ValueError(f"unknown output format '{output_format}'")
+    rows = sum(len(block.dates) for block in blocks)
+    seconds = time.perf_counter() - start
+    return PipelineReport(rows, seconds, rows / seconds if seconds > 0 else np.nan, peak_rss_mb())
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size of the process in MB, NaN where the platform does not report it
+    """
+    if resource is None:
+        return np.nan
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10  # Bytes on macOS, kilobytes elsewhere
+
+
+def read_manifest(path, sep=";"):
+    """
+    Reads a manifest of station-year files, one row per file with columns input_path, lat, lng, lng_std, altitude,
+    shadowband_width, shadowband_radius and optionally station
+
+    Parameters
+    ----------
+    path : str
+        manifest file
+    sep : str
+        column delimiter
+
+    Returns
+    -------
+    jobs : list of StationJob
+    """
+    manifest = pd.read_csv(path, sep=sep)
+    if "station" not in manifest:
+        manifest["station"] = None
+    manifest = manifest.astype({field: float for field in StationJob._fields[1:-1]})
+    return [StationJob(row.input_path, *(float(getattr(row, field)) for field in StationJob._fields[1:-1]),
+                       None if pd.isna(row.station) else str(row.station))
+            for row in manifest.itertuples(index=False)]
+
+
+def correct_manifest(jobs, output_dir, workers=None, chunk_rows=44640, output_format="csv"):
+    """
+    Runs correct_station_file() on each station-year of the manifest, distributing the jobs across a process pool
+
+    Parameters
+    ----------
+    jobs : iterable of StationJob
+        station-year files and their site parameters, see read_manifest()
+    output_dir : str
+        directory of the outputs: <station>-<file name>-corrected.csv per job for CSV (<file name>-corrected.csv
+        without station), the partition root for Parquet, each job writing its own part-<index in jobs> files.
+        Raises ValueError before starting if two CSV jobs would write the same file, as same-named inputs of
+        different directories without a station do, or if a Parquet job has no station
+    workers : int, optional
+        number of processes, os.cpu_count() by default
+    chunk_rows : int
+        rows per chunk of each pipeline
+    output_format : str
+        "csv" or "parquet"
+
+    Returns
+    -------
+    results : list of JobResult
+        one per job, in the order of jobs. A failing job reports its error instead of stopping the batch
+    """
+    jobs = list(jobs)
+    output_paths = [_output_path(job, output_dir, output_format) for job in jobs]
+    if output_format == "csv":
+        duplicates = sorted({path for path in output_paths if output_paths.count(path) > 1})
+        if duplicates:
+            raise ValueError(f"several jobs would write {', '.join(duplicates)}, give them distinct stations")
+    elif output_format == "parquet" and any(job.station is None for job in jobs):
+        raise ValueError("Parquet output requires a station for every job")
+    os.makedirs(output_dir, exist_ok=True)
+    # Largest files first so that the pool is not left waiting on a big file started last
+    order = sorted(range(len(jobs)), key=lambda index: -_file_size(jobs[index].input_path))
+    results = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {index: executor.submit(_run_job, jobs[index], output_paths[index], chunk_rows, output_format,
+                                          index)
+                   for index in order}
+        for index, future in futures.items():
+            results[index] = future.result()
+    return results
+
+
+def _output_path(job, output_dir, output_format):
+    if output_format != "csv":
+        return output_dir
+    name = os.path.splitext(os.path.basename(job.input_path))[0]
+    return os.path.join(output_dir, f"{name if job.station is None else job.station + '-' + name}-corrected.csv")
+
+
+def _run_job(job, output_path, chunk_rows, output_format, part):
+    try:
+        report = correct_station_file(job.input_path, output_path, job.lat, job.lng, job.lng_std, job.altitude,
+                                      job.shadowband_width, job.shadowband_radius, chunk_rows=chunk_rows,
+                                      output_format=output_format, station=job.station, part=part)
+    except Exception as error:
+        return JobResult(job, output_path, None, f"{type(error).__name__}: {error}")
+    return JobResult(job, output_path, report, None)
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
@@ -0,0 +1,117 @@
+import re
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+from lebaron.instrumentation import stage
+
+DATE_FORMAT = "%d/%m/%Y %H:%M"
+_DIRECTIVE_WIDTHS = {"d": 2, "m": 2, "Y": 4, "H": 2, "M": 2, "S": 2}
+
+
+class StationBlock(NamedTuple):
+    dates: np.ndarray  # datetime64[ns], standard (or local) time
+    glo_h: np.ndarray
+    dif_hu: np.ndarray
+
+
+def parse_dates(strings, date_format=DATE_FORMAT):
+    """
+    Parses fixed-width date strings with byte arithmetic instead of strptime, falling back to pandas.to_datetime()
+    when the strings do not all match the width and digits of date_format
+
+    Parameters
+    ----------
+    strings : array-like
+        date strings
+    date_format : str
+        strptime format made of %d, %m, %Y, %H, %M, %S and single character separators
+
+    Returns
+    -------
+    dates : datetime64[ns] array
+        parsed dates
+    """
+    strings = np.asarray(strings, dtype=object)
+    fields = {}
+    position = 0
+    for directive, _ in re.findall(r"%(.)|(.)", date_format, flags=re.DOTALL):
+        if directive:
+            if directive not in _DIRECTIVE_WIDTHS:
+                return _parse_dates_pandas(strings, date_format)
+            fields[directive] = (position, position + _DIRECTIVE_WIDTHS[directive])
+            position += _DIRECTIVE_WIDTHS[directive]
+        else:
+            position += 1
+    try:
+        raw = strings.astype("S")
+    except (UnicodeEncodeError, TypeError, ValueError):
+        return _parse_dates_pandas(strings, date_format)
+    if len(raw) == 0 or raw.dtype.itemsize != position or np.any(np.char.str_len(raw) != position):
+        return _parse_dates_pandas(strings, date_format)
+    digits = raw.view(np.uint8).reshape(len(raw), position).astype(np.int64) - ord("0")
+
+    def field(directive, default):
+        if directive not in fields:
+            return np.full(len(raw), default, dtype=np.int64)
+        start, stop = fields[directive]
+        value = np.zeros(len(raw), dtype=np.int64)
+        for column in range(start, stop):
+            value = value * 10 + digits[:, column]
+        return value
+
+    used_columns = [column for start, stop in fields.values() for column in range(start, stop)]
+    if np.any((digits[:, used_columns] < 0) | (digits[:, used_columns] > 9)):
+        return _parse_dates_pandas(strings, date_format)
+    year, month, day = field("Y", 1970), field("m", 1), field("d", 1)
+    hour, minute, second = field("H", 0), field("M", 0), field("S", 0)
+    months = (year - 1970) * 12 + month - 1
+    dates = months.astype("datetime64[M]").astype("datetime64[D]") + (day - 1)
+    if (np.any((month < 1) | (month > 12) | (day < 1) | (hour > 23) | (minute > 59) | (second > 59)) or
+            np.any(dates.astype("datetime64[M]") != months.astype("datetime64[M]"))):
+        return _parse_dates_pandas(strings, date_format)
+    return dates.astype("datetime64[ns]") + ((hour * 60 + minute) * 60 + second).astype("timedelta64[s]")
+
+
+def _parse_dates_pandas(strings, date_format):
+    return pd.to_datetime(pd.Series(strings), format=date_format).to_numpy(dtype="datetime64[ns]")
+
+
+def read_station_csv(path, chunk_rows=44640, date_column="fecha", glo_column="IRGLO", dif_column="IRDIF",
+                     dtype=np.float64, sep=";", date_format=DATE_FORMAT):
+    """
+    Streams a station file in blocks of at most chunk_rows rows, so that files of any size are read in bounded memory
+
+    Parameters
+    ----------
+    path : str or file-like
+        semicolon delimited station file, in chronological order
+    chunk_rows : int
+        rows per block, 44640 (31 days of minute data) by default
+    date_column, glo_column, dif_column : str
+        names of the date, GHI and DIF columns
+    dtype : numpy dtype
+        dtype of the irradiance columns, float64 or float32
+    sep : str
+        column delimiter
+    date_format : str
+        format of the date column, parsed with parse_dates()
+
+    Returns
+    -------
+    blocks : generator of StationBlock
+        aligned dates, GHI and DIF arrays of each block, sorted by date within the block
+    """
+    chunks = pd.read_csv(path, sep=sep, usecols=[date_column, glo_column, dif_column], chunksize=chunk_rows,
+                         dtype={date_column: object, glo_column: dtype, dif_column: dtype})
+    while True:
+        with stage("read_csv") as timer:
+            chunk = next(chunks, None)
+            if chunk is None:
+                timer.discard()  # End of file, not a read
+                return
+            timer.add_rows(len(chunk))
+            timer.count_nan(chunk[glo_column].to_numpy())
+        with stage("parse_dates", len(chunk)):
+            dates = parse_dates(chunk[date_column].to_numpy(), date_format)
+        order = np.argsort(dates, kind="stable")
+        yield StationBlock(dates[order], chunk[glo_column].to_numpy()[order], chunk[dif_column].to_numpy()[order])
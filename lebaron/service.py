@@ -0,0 +1,253 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+from typing import NamedTuple
+import numpy as np
+from lebaron.incremental import read_tail
+from lebaron.pipeline import correct_blocks, read_manifest
+from lebaron.reader import StationBlock
+from lebaron.table import LEBARON_TABLE
+
+'''
+Near real time correction of datalogger feeds. Minute records of many stations arrive as JSON lines on a local socket
+or as lines appended to watched station files, are micro-batched per station, corrected and QC flagged, and emitted
+as JSON lines:
+
+    python -m lebaron.service manifest.csv --port 8765 --output corrected.jsonl
+    python -m lebaron.service manifest.csv --watch --output corrected.jsonl
+
+The manifest is the one of lebaron.pipeline.read_manifest(). Socket records look like
+{"station": "mendoza", "datetime": "2022-01-01T12:00", "glo_h": 812.3, "dif_hu": 120.5}.
+'''
+
+
+LATENCY_WINDOW = 100000  # Most recent record latencies kept for the percentiles
+
+
+class LatencyReport(NamedTuple):
+    records: int  # Records emitted since the service started
+    p50: float  # Seconds from arrival to emission
+    p90: float
+    p99: float
+    max: float
+
+
+class IngestionService:
+    """
+    Micro-batching correction service: one queue and one worker task per station. A worker takes the records waiting
+    in its queue, waits up to max_delay for more until batch_size, and corrects the batch in a thread so that
+    other stations keep flowing.
+    """
+
+    def __init__(self, sites, emit, batch_size=60, max_delay=0.5, table=LEBARON_TABLE, latency_window=LATENCY_WINDOW):
+        self.sites = sites  # Site and shadowband parameters of each station name, as in correct_blocks()
+        self.emit = emit  # Called with the list of output records of each batch
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.table = table
+        self._queues = {}
+        self._workers = []
+        self._latencies = deque(maxlen=latency_window)  # Ring buffer of the latencies of the most recent records
+        self._records = 0
+
+    def submit(self, station, dates, glo_h, dif_hu):
+        """
+        Queues measurements of one station, stamping their arrival time
+
+        Parameters
+        ----------
+        station : str
+            station name, one of sites
+        dates : array-like
+            standard (or local) times
+        glo_h, dif_hu : array-like
+            global and diffuse irradiance measured under the shadowband
+        """
+        if station not in self.sites:
+            raise KeyError(f"unknown station '{station}'")
+        if station not in self._queues:
+            self._queues[station] = asyncio.Queue()
+            self._workers.append(asyncio.create_task(self._worker(station)))
+        arrival = time.perf_counter()
+        dates = np.atleast_1d(np.asarray(dates, dtype="datetime64[ns]"))
+        glo_h = np.atleast_1d(np.asarray(glo_h, dtype=np.float64))
+        dif_hu = np.atleast_1d(np.asarray(dif_hu, dtype=np.float64))
+        self._queues[station].put_nowait((arrival, StationBlock(dates, glo_h, dif_hu)))
+
+    async def drain(self):
+        """
+        Waits until every queued record has been emitted
+        """
+        await asyncio.gather(*(queue.join() for queue in self._queues.values()))
+
+    async def close(self):
+        await self.drain()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+
+    def latency_report(self):
+        """
+        Percentiles of the end to end latency of the most recent records, at most latency_window of them, so that
+        memory and cost stay bounded however long the service runs
+
+        Returns
+        -------
+        report : LatencyReport
+        """
+        if not self._latencies:
+            return LatencyReport(self._records, np.nan, np.nan, np.nan, np.nan)
+        latencies = np.fromiter(self._latencies, dtype=np.float64, count=len(self._latencies))
+        return LatencyReport(self._records, *(float(value) for value in np.percentile(latencies, [50, 90, 99])),
+                             float(latencies.max()))
+
+    async def _worker(self, station):
+        queue = self._queues[station]
+        while True:
+            items = [await queue.get()]
+            deadline = time.perf_counter() + self.max_delay
+            while sum(len(block.dates) for _, block in items) < self.batch_size:
+                try:
+                    items.append(await asyncio.wait_for(queue.get(), deadline - time.perf_counter()))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                records = await asyncio.to_thread(self._correct, station, [block for _, block in items])
+                emitted = time.perf_counter()
+                for arrival, block in items:
+                    self._latencies.extend([emitted - arrival] * min(len(block.dates), self._latencies.maxlen))
+                    self._records += len(block.dates)
+                self.emit(records)
+            except Exception as error:  # A bad batch must not stop the station
+                print(f"{station}: batch dropped, {type(error).__name__}: {error}", file=sys.stderr)
+            finally:
+                for _ in items:
+                    queue.task_done()
+
+    def _correct(self, station, blocks):
+        block = StationBlock(*(np.concatenate(columns) for columns in zip(*blocks)))
+        corrected, = correct_blocks([block], *self.sites[station], table=self.table)
+        return [dict(station=station, datetime=str(date), glo_h=_json_float(glo_h), dif_hu=_json_float(dif_hu),
+                     dif_hu_corrected=_json_float(dif_hu_corrected),
+                     dif_correction_factor=_json_float(factor), qc_flags=int(flags))
+                for date, glo_h, dif_hu, dif_hu_corrected, factor, flags in
+                zip(corrected.dates.astype("datetime64[s]"), corrected.glo_h, corrected.dif_hu,
+                    corrected.dif_hu_corrected, corrected.dif_correction_factor, corrected.qc_flags)]
+
+
+async def serve_socket(service, host="127.0.0.1", port=8765, path=None):
+    """
+    Feeds the service with JSON line records sent by any number of local clients
+
+    Parameters
+    ----------
+    service : IngestionService
+    host, port : str, int
+        TCP address to listen on, used unless path is given
+    path : str, optional
+        Unix socket path to listen on
+
+    Returns
+    -------
+    server : asyncio.Server
+    """
+    async def handle(reader, writer):
+        while line := await reader.readline():
+            try:
+                record = json.loads(line)
+                service.submit(record["station"], record["datetime"], record["glo_h"], record["dif_hu"])
+            except (ValueError, KeyError, TypeError) as error:
+                writer.write(json.dumps(dict(error=f"{type(error).__name__}: {error}")).encode() + b"\n")
+                await writer.drain()
+        writer.close()
+
+    if path is not None:
+        return await asyncio.start_unix_server(handle, path=path)
+    return await asyncio.start_server(handle, host=host, port=port)
+
+
+async def watch_files(service, paths, interval=1.0):
+    """
+    Feeds the service with the lines appended to station files, polling them every interval seconds. Existing lines
+    are read on the first poll.
+
+    Parameters
+    ----------
+    service : IngestionService
+    paths : dict
+        station file of each station name
+    interval : float
+        seconds between polls
+    """
+    watermarks = dict.fromkeys(paths)
+    while True:
+        for station, path in paths.items():
+            try:
+                block, _, watermarks[station] = await asyncio.to_thread(read_tail, path, watermarks[station])
+            except FileNotFoundError:  # Not created yet by the datalogger
+                continue
+            if block is not None:
+                service.submit(station, *block)
+        await asyncio.sleep(interval)
+
+
+def _json_float(value):
+    return None if np.isnan(value) else float(value)
+
+
+async def _serve(arguments):
+    jobs = read_manifest(arguments.manifest)
+    stations = {}
+    for job in jobs:
+        station = os.path.splitext(os.path.basename(job.input_path))[0] if job.station is None else job.station
+        if station in stations:  # Their records would be merged into one feed and corrected with one site
+            raise ValueError(f"several manifest rows are station '{station}', give them distinct stations")
+        stations[station] = job
+    output = sys.stdout if arguments.output == "-" else open(arguments.output, "a")
+
+    def emit(records):
+        output.write("".join(json.dumps(record) + "\n" for record in records))
+        output.flush()
+
+    service = IngestionService({station: tuple(job)[1:7] for station, job in stations.items()}, emit,
+                               batch_size=arguments.batch_size, max_delay=arguments.max_delay)
+    if arguments.watch:
+        feed = asyncio.create_task(watch_files(service, {station: job.input_path for station, job in stations.items()},
+                                               interval=arguments.interval))
+    else:
+        server = await serve_socket(service, port=arguments.port, path=arguments.unix_socket)
+        feed = asyncio.create_task(server.serve_forever())
+    try:
+        while not feed.done():
+            await asyncio.sleep(arguments.report_interval)
+            print(service.latency_report(), file=sys.stderr)
+    finally:
+        feed.cancel()
+        await service.close()
+        if output is not sys.stdout:
+            output.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Near real time LeBaron correction and QC of datalogger feeds")
+    parser.add_argument("manifest", help="stations and their site parameters, see lebaron.pipeline.read_manifest()")
+    parser.add_argument("--watch", action="store_true", help="watch the input files of the manifest")
+    parser.add_argument("--port", type=int, default=8765, help="local TCP port of the JSON lines feed")
+    parser.add_argument("--unix-socket", help="Unix socket path of the JSON lines feed, instead of the TCP port")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between polls of the watched files")
+    parser.add_argument("--batch-size", type=int, default=60)
+    parser.add_argument("--max-delay", type=float, default=0.5, help="seconds a record waits for its batch to fill")
+    parser.add_argument("--report-interval", type=float, default=60, help="seconds between latency reports")
+    parser.add_argument("--output", default="-", help="JSON lines output, standard output by default")
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,17 @@
 from datetime import timedelta
+from functools import cached_property
 import numpy as np
 import solarpy as sp
+from lebaron import astronomy
+from lebaron.cache import daily_geometry_cache
+from lebaron.table import LEBARON_TABLE, lebaron_scalar_cuts
+from lebaron.vectorized import dif_correction
 
 
 class SolarMeasurement:
+    lebaron_table = LEBARON_TABLE
+    geometry_cache = daily_geometry_cache
+
     def __init__(self, clock_datetime, glo_h, dif_hu, lat, lng, lng_std, altitude, shadowband_width, shadowband_radius):
         self.datetime = clock_datetime
         self.glo_h = glo_h
@@ -14,23 +22,64 @@ class SolarMeasurement:
         self.altitude = altitude
         self.shadowband_width = shadowband_width
         self.shadowband_radius = shadowband_radius
-        self.declination = sp.declination(self.datetime)
-        self.solar_datetime = self.standard2solar_time_modified()
-        self.sunrise = sp.sunrise_time(self.datetime, self.lat)
-        self.sunset = sp.sunset_time(self.datetime, self.lat)
-        self.sunset_hour_angle = sp.sunset_hour_angle(self.datetime, self.lat)
-        self.zenithal_angle = sp.theta_z(self.solar_datetime, self.lat)  # In radians
-        self.dir_nu = (self.glo_h - self.dif_hu) / np.cos(self.zenithal_angle)
-        self.delta = self.dif_hu * sp.air_mass_kastenyoung1989(np.rad2deg(self.zenithal_angle),
-                                                               self.altitude) / sp.gon(self.datetime)
-        self.epsilon = None
-        self.c_i = None
-        self.lebaron_parameters = None
-        self.dif_correction_factor = None
+
+    # Derived quantities are computed on first access and memoized, so only the requested dependency chain is evaluated
+
+    @cached_property
+    def daily_geometry(self):
+        return self.geometry_cache.get(self.datetime, self.lat, self.shadowband_width, self.shadowband_radius)
+
+    @cached_property
+    def declination(self):
+        return self.daily_geometry.declination
+
+    @cached_property
+    def solar_datetime(self):
+        return self.standard2solar_time_modified()
+
+    @cached_property
+    def sunrise(self):
+        return self.daily_geometry.sunrise
+
+    @cached_property
+    def sunset(self):
+        return self.daily_geometry.sunset
+
+    @cached_property
+    def sunset_hour_angle(self):
+        return self.daily_geometry.sunset_hour_angle
+
+    @cached_property
+    def zenithal_angle(self):
+        return sp.theta_z(self.solar_datetime, self.lat)  # In radians
+
+    @cached_property
+    def dir_nu(self):
+        return (self.glo_h - self.dif_hu) / np.cos(self.zenithal_angle)
+
+    @cached_property
+    def delta(self):
+        return self.dif_hu * sp.air_mass_kastenyoung1989(np.rad2deg(self.zenithal_angle),
+                                                         self.altitude) / sp.gon(self.datetime)
+
+    @cached_property
+    def epsilon(self):
         self.set_epsilon()
-        self.set_c_i()
+        return self.__dict__["epsilon"]
+
+    @cached_property
+    def c_i(self):
+        return self.daily_geometry.c_i
+
+    @cached_property
+    def lebaron_parameters(self):
         self.set_lebaron_parameters()
+        return self.__dict__["lebaron_parameters"]
+
+    @cached_property
+    def dif_correction_factor(self):
         self.set_dif_correction_factor()
+        return self.__dict__["dif_correction_factor"]
 
     def set_epsilon(self):
         sunrise = self.sunrise
@@ -48,649 +97,15 @@ class SolarMeasurement:
                          np.cos(np.deg2rad(self.lat)) * np.cos(self.declination) * np.sin(self.sunset_hour_angle)))
 
     def set_lebaron_parameters(self):
-        zenith_angle_deg = np.rad2deg(self.zenithal_angle)
-        if 0 <= zenith_angle_deg <= 35:
-            zenith_cut = 1
-        elif 35 < zenith_angle_deg <= 50:
-            zenith_cut = 2
-        elif 50 < zenith_angle_deg <= 60:
-            zenith_cut = 3
-        elif 60 < zenith_angle_deg <= 90:
-            zenith_cut = 4
-        else:
-            zenith_cut = np.nan
-
-        if 1 <= self.c_i <= 1.068:
-            geometric_cut = 1
-        elif 1.068 <= self.c_i <= 1.1:
-            geometric_cut = 2
-        elif 1.1 <= self.c_i <= 1.132:
-            geometric_cut = 3
-        elif 1.132 < self.c_i:
-            geometric_cut = 4
-        else:
-            geometric_cut = np.nan
-
-        if 0 <= self.epsilon <= 1.253:
-            epsilon_cut = 1
-        elif 1.253 <= self.epsilon <= 2.134:
-            epsilon_cut = 2
-        elif 2.134 <= self.epsilon <= 5.980:
-            epsilon_cut = 3
-        elif 5.980 < self.epsilon:
-            epsilon_cut = 4
-        else:
-            epsilon_cut = np.nan
-
-        if 0 <= self.delta <= 0.120:
-            delta_cut = 1
-        elif 0.120 <= self.delta <= 0.2:
-            delta_cut = 2
-        elif 0.2 <= self.delta <= 0.3:
-            delta_cut = 3
-        elif 0.3 < self.delta:
-            delta_cut = 4
-        else:
-            delta_cut = np.nan
-        self.lebaron_parameters = (zenith_cut, geometric_cut, epsilon_cut, delta_cut)
+        self.lebaron_parameters = lebaron_scalar_cuts(np.rad2deg(self.zenithal_angle), self.c_i, self.epsilon,
+                                                      self.delta)
 
     def set_dif_correction_factor(self):
-        i = self.lebaron_parameters[0]
-        j = self.lebaron_parameters[1]
-        k = self.lebaron_parameters[2]
-        el = self.lebaron_parameters[3]
-        if k == 1 and el == 1:
-            if i == 1:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.173
-            elif i == 2:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.104
-                elif j == 3:
-                    self.dif_correction_factor = 1.115
-                elif j == 4:
-                    self.dif_correction_factor = 1.163
-            elif i == 3:
-                if j == 1:
-                    self.dif_correction_factor = 1.069
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.119
-                elif j == 4:
-                    self.dif_correction_factor = 1.140
-            elif i == 4:
-                if j == 1:
-                    self.dif_correction_factor = 1.047
-                elif j == 2:
-                    self.dif_correction_factor = 1.063
-                elif j == 3:
-                    self.dif_correction_factor = 1.074
-                elif j == 4:
-                    self.dif_correction_factor = 1.030
-        elif k == 2 and el == 1:
-            if i == 1:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.248
-            elif i == 2:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.184
-            elif i == 3:
-                if j == 1:
-                    self.dif_correction_factor = 1.161
-                elif j == 2:
-                    self.dif_correction_factor = 1.161
-                elif j == 3:
-                    self.dif_correction_factor = 1.147
-                elif j == 4:
-                    self.dif_correction_factor = 1.168
-            elif i == 4:
-                if j == 1:
-                    self.dif_correction_factor = 1.076
-                elif j == 2:
-                    self.dif_correction_factor = 1.078
-                elif j == 3:
-                    self.dif_correction_factor = 1.104
-                elif j == 4:
-                    self.dif_correction_factor = 1.146
-        elif k == 3 and el == 1:
-            if i == 1:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.156
-            elif i == 2:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.156
-            elif i == 3:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.156
-            elif i == 4:
-                if j == 1:
-                    self.dif_correction_factor = 1.187
-                elif j == 2:
-                    self.dif_correction_factor = 1.167
-                elif j == 3:
-                    self.dif_correction_factor = 1.139
-                elif j == 4:
-                    self.dif_correction_factor = 1.191
-        elif k == 4 and el == 1:
-            if i == 1:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.181
-            elif i == 2:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 0.990
-                elif j == 4:
-                    self.dif_correction_factor = 1.104
-            elif i == 3:
-                if j == 1:
-                    self.dif_correction_factor = 1.015
-                elif j == 2:
-                    self.dif_correction_factor = 1.016
-                elif j == 3:
-                    self.dif_correction_factor = 0.946
-                elif j == 4:
-                    self.dif_correction_factor = 1.027
-            elif i == 4:
-                if j == 1:
-                    self.dif_correction_factor = 0.925
-                elif j == 2:
-                    self.dif_correction_factor = 0.967
-                elif j == 3:
-                    self.dif_correction_factor = 0.977
-                elif j == 4:
-                    self.dif_correction_factor = 1.150
-        elif k == 1 and el == 2:
-            if i == 1:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.176
-            elif i == 2:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.095
-                elif j == 3:
-                    self.dif_correction_factor = 1.130
-                elif j == 4:
-                    self.dif_correction_factor = 1.162
-            elif i == 3:
-                if j == 1:
-                    self.dif_correction_factor = 1.073
-                elif j == 2:
-                    self.dif_correction_factor = 1.089
-                elif j == 3:
-                    self.dif_correction_factor = 1.115
-                elif j == 4:
-                    self.dif_correction_factor = 1.142
-            elif i == 4:
-                if j == 1:
-                    self.dif_correction_factor = 1.058
-                elif j == 2:
-                    self.dif_correction_factor = 1.076
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.156
-        elif k == 2 and el == 2:
-            if i == 1:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.211
-            elif i == 2:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.186
-                elif j == 4:
-                    self.dif_correction_factor = 1.194
-            elif i == 3:
-                if j == 1:
-                    self.dif_correction_factor = 1.086
-                elif j == 2:
-                    self.dif_correction_factor = 1.130
-                elif j == 3:
-                    self.dif_correction_factor = 1.168
-                elif j == 4:
-                    self.dif_correction_factor = 1.177
-            elif i == 4:
-                if j == 1:
-                    self.dif_correction_factor = 1.074
-                elif j == 2:
-                    self.dif_correction_factor = 1.102
-                elif j == 3:
-                    self.dif_correction_factor = 1.118
-                elif j == 4:
-                    self.dif_correction_factor = 1.174
-        elif k == 3 and el == 2:
-            if i == 1:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.237
-            elif i == 2:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.203
-                elif j == 4:
-                    self.dif_correction_factor = 1.212
-            elif i == 3:
-                if j == 1:
-                    self.dif_correction_factor = 1.080
-                elif j == 2:
-                    self.dif_correction_factor = 1.195
-                elif j == 3:
-                    self.dif_correction_factor = 1.211
-                elif j == 4:
-                    self.dif_correction_factor = 1.185
-            elif i == 4:
-                if j == 1:
-                    self.dif_correction_factor = 1.140
-                elif j == 2:
-                    self.dif_correction_factor = 1.098
-                elif j == 3:
-                    self.dif_correction_factor = 1.191
-                elif j == 4:
-                    self.dif_correction_factor = 1.181
-        elif k == 4 and el == 2:
-            if i == 1:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.217
-            elif i == 2:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.120
-                elif j == 4:
-                    self.dif_correction_factor = 1.180
-            elif i == 3:
-                if j == 1:
-                    self.dif_correction_factor = 1.182
-                elif j == 2:
-                    self.dif_correction_factor = 1.115
-                elif j == 3:
-                    self.dif_correction_factor = 1.081
-                elif j == 4:
-                    self.dif_correction_factor = 1.111
-            elif i == 4:
-                if j == 1:
-                    self.dif_correction_factor = 1.057
-                elif j == 2:
-                    self.dif_correction_factor = 1.119
-                elif j == 3:
-                    self.dif_correction_factor = 1.133
-                elif j == 4:
-                    self.dif_correction_factor = 1.033
-        elif k == 1 and el == 3:
-            if i == 1:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.182
-            elif i == 2:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.128
-                elif j == 4:
-                    self.dif_correction_factor = 1.159
-            elif i == 3:
-                if j == 1:
-                    self.dif_correction_factor = 1.076
-                elif j == 2:
-                    self.dif_correction_factor = 1.088
-                elif j == 3:
-                    self.dif_correction_factor = 1.131
-                elif j == 4:
-                    self.dif_correction_factor = 1.129
-            elif i == 4:
-                if j == 1:
-                    self.dif_correction_factor = 1.060
-                elif j == 2:
-                    self.dif_correction_factor = 1.085
-                elif j == 3:
-                    self.dif_correction_factor = 1.103
-                elif j == 4:
-                    self.dif_correction_factor = 1.156
-        elif k == 2 and el == 3:
-            if i == 1:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.221
-            elif i == 2:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.171
-                elif j == 3:
-                    self.dif_correction_factor = 1.180
-                elif j == 4:
-                    self.dif_correction_factor = 1.213
-            elif i == 3:
-                if j == 1:
-                    self.dif_correction_factor = 1.135
-                elif j == 2:
-                    self.dif_correction_factor = 1.148
-                elif j == 3:
-                    self.dif_correction_factor = 1.176
-                elif j == 4:
-                    self.dif_correction_factor = 1.197
-            elif i == 4:
-                if j == 1:
-                    self.dif_correction_factor = 1.092
-                elif j == 2:
-                    self.dif_correction_factor = 1.119
-                elif j == 3:
-                    self.dif_correction_factor = 1.143
-                elif j == 4:
-                    self.dif_correction_factor = 1.182
-        elif k == 3 and el == 3:
-            if i == 1:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.238
-            elif i == 2:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.160
-                elif j == 3:
-                    self.dif_correction_factor = 1.207
-                elif j == 4:
-                    self.dif_correction_factor = 1.230
-            elif i == 3:
-                if j == 1:
-                    self.dif_correction_factor = 1.169
-                elif j == 2:
-                    self.dif_correction_factor = 1.191
-                elif j == 3:
-                    self.dif_correction_factor = 1.193
-                elif j == 4:
-                    self.dif_correction_factor = 1.210
-            elif i == 4:
-                if j == 1:
-                    self.dif_correction_factor = 1.150
-                elif j == 2:
-                    self.dif_correction_factor = 1.133
-                elif j == 3:
-                    self.dif_correction_factor = 1.180
-                elif j == 4:
-                    self.dif_correction_factor = 1.156
-        elif k == 4 and el == 3:
-            if i == 1:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.156
-            elif i == 2:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.156
-            elif i == 3:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.156
-            elif i == 4:
-                if j == 1:
-                    self.dif_correction_factor = 1.089
-                elif j == 2:
-                    self.dif_correction_factor = 1.194
-                elif j == 3:
-                    self.dif_correction_factor = 1.216
-                elif j == 4:
-                    self.dif_correction_factor = 1.064
-        elif k == 1 and el == 4:
-            if i == 1:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.191
-            elif i == 2:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.105
-                elif j == 3:
-                    self.dif_correction_factor = 1.143
-                elif j == 4:
-                    self.dif_correction_factor = 1.168
-            elif i == 3:
-                if j == 1:
-                    self.dif_correction_factor = 1.085
-                elif j == 2:
-                    self.dif_correction_factor = 1.093
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.156
-            elif i == 4:
-                if j == 1:
-                    self.dif_correction_factor = 1.069
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.156
-        elif k == 2 and el == 4:
-            if i == 1:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.238
-            elif i == 2:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.148
-                elif j == 3:
-                    self.dif_correction_factor = 1.195
-                elif j == 4:
-                    self.dif_correction_factor = 1.230
-            elif i == 3:
-                if j == 1:
-                    self.dif_correction_factor = 1.132
-                elif j == 2:
-                    self.dif_correction_factor = 1.160
-                elif j == 3:
-                    self.dif_correction_factor = 1.183
-                elif j == 4:
-                    self.dif_correction_factor = 1.210
-            elif i == 4:
-                if j == 1:
-                    self.dif_correction_factor = 1.118
-                elif j == 2:
-                    self.dif_correction_factor = 1.116
-                elif j == 3:
-                    self.dif_correction_factor = 1.150
-                elif j == 4:
-                    self.dif_correction_factor = 1.185
-        elif k == 3 and el == 4:
-            if i == 1:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.232
-            elif i == 2:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.206
-                elif j == 3:
-                    self.dif_correction_factor = 1.210
-                elif j == 4:
-                    self.dif_correction_factor = 1.238
-            elif i == 3:
-                if j == 1:
-                    self.dif_correction_factor = 1.144
-                elif j == 2:
-                    self.dif_correction_factor = 1.178
-                elif j == 3:
-                    self.dif_correction_factor = 1.226
-                elif j == 4:
-                    self.dif_correction_factor = 1.216
-            elif i == 4:
-                if j == 1:
-                    self.dif_correction_factor = 1.117
-                elif j == 2:
-                    self.dif_correction_factor = 1.155
-                elif j == 3:
-                    self.dif_correction_factor = 1.178
-                elif j == 4:
-                    self.dif_correction_factor = 1.167
-        elif k == 4 and el == 4:
-            if i == 1:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.156
-            elif i == 2:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.156
-            elif i == 3:
-                if j == 1:
-                    self.dif_correction_factor = 1.051
-                elif j == 2:
-                    self.dif_correction_factor = 1.082
-                elif j == 3:
-                    self.dif_correction_factor = 1.117
-                elif j == 4:
-                    self.dif_correction_factor = 1.156
-            elif i == 4:
-                if j == 1:
-                    self.dif_correction_factor = 1.024
-                elif j == 2:
-                    self.dif_correction_factor = 1.025
-                elif j == 3:
-                    self.dif_correction_factor = 1.162
-                elif j == 4:
-                    self.dif_correction_factor = 1.142
+        i, j, k, el = self.lebaron_parameters
+        if 1 <= i <= 4 and 1 <= j <= 4 and 1 <= k <= 4 and 1 <= el <= 4:  # NaN cuts fail the comparisons
+            self.dif_correction_factor = float(self.lebaron_table[i - 1, j - 1, k - 1, el - 1])
+        else:
+            self.dif_correction_factor = None
 
     def standard2solar_time_modified(self):
         """
@@ -732,3 +147,87 @@ class SolarMeasurement:
             return abs(lng_input)
         elif 0 < lng_input < 180:
             return lng_input + 180
+
+
+class SolarMeasurementSet:
+    """
+    Columnar counterpart of SolarMeasurement for many measurements of one site. Every field of SolarMeasurement is
+    a NumPy column (NaN where SolarMeasurement has NaN or None), site parameters are stored once and indexing
+    returns lightweight SolarMeasurementView rows.
+    """
+    lebaron_table = LEBARON_TABLE
+    site_parameters = ("lat", "lng", "lng_std", "altitude", "shadowband_width", "shadowband_radius")
+    columns = ("datetime", "glo_h", "dif_hu", "declination", "solar_datetime", "sunrise", "sunset", "sunset_hour_angle",
+               "zenithal_angle", "dir_nu", "delta", "epsilon", "c_i", "zenith_cut", "geometric_cut", "epsilon_cut",
+               "delta_cut", "dif_correction_factor")
+
+    def __init__(self, dates, glo_h, dif_hu, lat, lng, lng_std, altitude, shadowband_width, shadowband_radius):
+        self.lat = lat
+        self.lng = lng
+        self.lng_std = lng_std
+        self.altitude = altitude
+        self.shadowband_width = shadowband_width
+        self.shadowband_radius = shadowband_radius
+        self.datetime = astronomy.to_datetime64(dates)
+        self.glo_h = np.asarray(glo_h, dtype=np.float64).ravel()
+        self.dif_hu = np.asarray(dif_hu, dtype=np.float64).ravel()
+        result = dif_correction(self.datetime, self.glo_h, self.dif_hu, lat, lng, lng_std, altitude,
+                                shadowband_width, shadowband_radius, table=self.lebaron_table)
+        # Day only columns evaluated once per day and broadcast
+        index, days = astronomy.daily_index(self.datetime)
+        day = astronomy.day_of_the_year(days)
+        sunset_hour_angle = astronomy.sunset_hour_angle(day, lat)
+        self.declination = astronomy.declination(day)[index]
+        self.solar_datetime = astronomy.standard2solar_time(self.datetime, lng, lng_std)
+        self.sunset_hour_angle = sunset_hour_angle[index]
+        self.sunrise = astronomy.sunrise_time(days, sunset_hour_angle)[index]
+        self.sunset = astronomy.sunset_time(days, sunset_hour_angle)[index]
+        self.zenithal_angle = result.zenithal_angle  # In radians
+        self.dir_nu = result.dir_nu
+        self.delta = result.delta
+        self.epsilon = result.epsilon
+        self.c_i = result.c_i
+        self.zenith_cut = result.zenith_cut
+        self.geometric_cut = result.geometric_cut
+        self.epsilon_cut = result.epsilon_cut
+        self.delta_cut = result.delta_cut
+        self.dif_correction_factor = result.dif_correction_factor
+
+    @property
+    def lebaron_parameters(self):
+        return np.column_stack((self.zenith_cut, self.geometric_cut, self.epsilon_cut, self.delta_cut))
+
+    def __len__(self):
+        return len(self.datetime)
+
+    def __getitem__(self, row):
+        if not isinstance(row, (int, np.integer)):
+            raise TypeError(f"measurement indices must be integers, not {type(row).__name__}")
+        if not -len(self) <= row < len(self):
+            raise IndexError("measurement index out of range")
+        return SolarMeasurementView(self, row % len(self))
+
+    def __iter__(self):
+        return (SolarMeasurementView(self, row) for row in range(len(self)))
+
+
+class SolarMeasurementView:
+    """
+    One row of a SolarMeasurementSet, read with the same attribute names as SolarMeasurement
+    """
+    __slots__ = ("measurements", "row")
+
+    def __init__(self, measurements, row):
+        self.measurements = measurements
+        self.row = row
+
+    def __getattr__(self, name):
+        if name in SolarMeasurementSet.columns:
+            return getattr(self.measurements, name)[self.row]
+        if name in SolarMeasurementSet.site_parameters:
+            return getattr(self.measurements, name)
+        raise AttributeError(f"'SolarMeasurementView' object has no attribute '{name}'")
+
+    @property
+    def lebaron_parameters(self):
+        return (self.zenith_cut, self.geometric_cut, self.epsilon_cut, self.delta_cut)
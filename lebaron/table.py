@@ -0,0 +1,191 @@
+from bisect import bisect_left
+import numpy as np
+
+# LeBaron diffuse correction factors indexed as [zenith cut, geometric cut, epsilon cut, delta cut], each cut from 1
+# to 4 stored at index cut - 1
+LEBARON_TABLE = np.array(
+    [[[[1.051, 1.051, 1.051, 1.051],
+       [1.051, 1.051, 1.051, 1.051],
+       [1.051, 1.051, 1.051, 1.051],
+       [1.051, 1.051, 1.051, 1.051]],
+      [[1.082, 1.082, 1.082, 1.082],
+       [1.082, 1.082, 1.082, 1.082],
+       [1.082, 1.082, 1.082, 1.082],
+       [1.082, 1.082, 1.082, 1.082]],
+      [[1.117, 1.117, 1.117, 1.117],
+       [1.117, 1.117, 1.117, 1.117],
+       [1.117, 1.117, 1.117, 1.117],
+       [1.117, 1.117, 1.117, 1.117]],
+      [[1.173, 1.176, 1.182, 1.191],
+       [1.248, 1.211, 1.221, 1.238],
+       [1.156, 1.237, 1.238, 1.232],
+       [1.181, 1.217, 1.156, 1.156]]],
+     [[[1.051, 1.051, 1.051, 1.051],
+       [1.051, 1.051, 1.051, 1.051],
+       [1.051, 1.051, 1.051, 1.051],
+       [1.051, 1.051, 1.051, 1.051]],
+      [[1.104, 1.095, 1.082, 1.105],
+       [1.082, 1.082, 1.171, 1.148],
+       [1.082, 1.082, 1.160, 1.206],
+       [1.082, 1.082, 1.082, 1.082]],
+      [[1.115, 1.130, 1.128, 1.143],
+       [1.117, 1.186, 1.180, 1.195],
+       [1.117, 1.203, 1.207, 1.210],
+       [0.990, 1.120, 1.117, 1.117]],
+      [[1.163, 1.162, 1.159, 1.168],
+       [1.184, 1.194, 1.213, 1.230],
+       [1.156, 1.212, 1.230, 1.238],
+       [1.104, 1.180, 1.156, 1.156]]],
+     [[[1.069, 1.073, 1.076, 1.085],
+       [1.161, 1.086, 1.135, 1.132],
+       [1.051, 1.080, 1.169, 1.144],
+       [1.015, 1.182, 1.051, 1.051]],
+      [[1.082, 1.089, 1.088, 1.093],
+       [1.161, 1.130, 1.148, 1.160],
+       [1.082, 1.195, 1.191, 1.178],
+       [1.016, 1.115, 1.082, 1.082]],
+      [[1.119, 1.115, 1.131, 1.117],
+       [1.147, 1.168, 1.176, 1.183],
+       [1.117, 1.211, 1.193, 1.226],
+       [0.946, 1.081, 1.117, 1.117]],
+      [[1.140, 1.142, 1.129, 1.156],
+       [1.168, 1.177, 1.197, 1.210],
+       [1.156, 1.185, 1.210, 1.216],
+       [1.027, 1.111, 1.156, 1.156]]],
+     [[[1.047, 1.058, 1.060, 1.069],
+       [1.076, 1.074, 1.092, 1.118],
+       [1.187, 1.140, 1.150, 1.117],
+       [0.925, 1.057, 1.089, 1.024]],
+      [[1.063, 1.076, 1.085, 1.082],
+       [1.078, 1.102, 1.119, 1.116],
+       [1.167, 1.098, 1.133, 1.155],
+       [0.967, 1.119, 1.194, 1.025]],
+      [[1.074, 1.117, 1.103, 1.117],
+       [1.104, 1.118, 1.143, 1.150],
+       [1.139, 1.191, 1.180, 1.178],
+       [0.977, 1.133, 1.216, 1.162]],
+      [[1.030, 1.156, 1.156, 1.156],
+       [1.146, 1.174, 1.182, 1.185],
+       [1.191, 1.181, 1.156, 1.167],
+       [1.150, 1.033, 1.064, 1.142]]]])
+
+
+# Published LeBaron cut edges. Cut k holds edges[k - 1] < value <= edges[k], except cut 1, which also holds value ==
+# edges[0]. A value on an inner edge (e.g. epsilon == 1.253) therefore falls in the lower cut, as the first matching
+# branch of the original if/elif chains did. Values outside [edges[0], edges[4]] or NaN get a NaN cut
+ZENITH_EDGES = (0, 35, 50, 60, 90)  # degrees
+GEOMETRIC_EDGES = (1, 1.068, 1.1, 1.132, np.inf)
+EPSILON_EDGES = (0, 1.253, 2.134, 5.980, np.inf)
+DELTA_EDGES = (0, 0.120, 0.2, 0.3, np.inf)
+
+
+def lebaron_cut(values, edges):
+    """
+    LeBaron cut (1 to 4) of each value, classified in one pass
+
+    Parameters
+    ----------
+    values : float or array-like
+        quantity to classify
+    edges : sequence of 5 floats
+        cut edges, one of ZENITH_EDGES, GEOMETRIC_EDGES, EPSILON_EDGES or DELTA_EDGES
+
+    Returns
+    -------
+    cut : float or float array
+        cut from 1 to 4, NaN for NaN or out of range values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    cut = np.searchsorted(edges[1:4], values, side="left") + 1.0
+    with np.errstate(invalid="ignore"):
+        return np.where((edges[0] <= values) & (values <= edges[4]), cut, np.nan)[()]
+
+
+def lebaron_cuts(zenith_angle_deg, c_i, epsilon, delta):
+    """
+    Zenith, geometric, epsilon and delta LeBaron cuts
+
+    Parameters
+    ----------
+    zenith_angle_deg : float or array-like
+        zenith angle in degrees
+    c_i : float or array-like
+        geometric correction factor
+    epsilon : float or array-like
+        sky clearness
+    delta : float or array-like
+        sky brightness
+
+    Returns
+    -------
+    cuts : tuple
+        zenith_cut, geometric_cut, epsilon_cut, delta_cut, as returned by lebaron_cut()
+    """
+    return (lebaron_cut(zenith_angle_deg, ZENITH_EDGES), lebaron_cut(c_i, GEOMETRIC_EDGES),
+            lebaron_cut(epsilon, EPSILON_EDGES), lebaron_cut(delta, DELTA_EDGES))
+
+
+def lebaron_scalar_cut(value, edges):
+    """
+    LeBaron cut (1 to 4) of a single value, lebaron_cut() without the array overhead for the per row APIs
+
+    Parameters
+    ----------
+    value : float
+        quantity to classify
+    edges : sequence of 5 floats
+        cut edges, one of ZENITH_EDGES, GEOMETRIC_EDGES, EPSILON_EDGES or DELTA_EDGES
+
+    Returns
+    -------
+    cut : int or float
+        cut from 1 to 4, NaN for NaN or out of range values
+    """
+    if not edges[0] <= value <= edges[4]:  # NaN fails both comparisons
+        return np.nan
+    return bisect_left(edges, value, 1, 4)  # Edges below the value, the lower cut owning a shared edge
+
+
+def lebaron_scalar_cuts(zenith_angle_deg, c_i, epsilon, delta):
+    """
+    Zenith, geometric, epsilon and delta LeBaron cuts of a single measurement
+
+    Parameters
+    ----------
+    zenith_angle_deg, c_i, epsilon, delta : float
+        as in lebaron_cuts()
+
+    Returns
+    -------
+    cuts : tuple
+        zenith_cut, geometric_cut, epsilon_cut, delta_cut, as returned by lebaron_scalar_cut()
+    """
+    return (lebaron_scalar_cut(zenith_angle_deg, ZENITH_EDGES), lebaron_scalar_cut(c_i, GEOMETRIC_EDGES),
+            lebaron_scalar_cut(epsilon, EPSILON_EDGES), lebaron_scalar_cut(delta, DELTA_EDGES))
+
+
+def lebaron_factor(zenith_cut, geometric_cut, epsilon_cut, delta_cut, table=LEBARON_TABLE):
+    """
+    Diffuse correction factor for the given LeBaron cuts, gathered from the table in one indexing operation
+
+    Parameters
+    ----------
+    zenith_cut, geometric_cut, epsilon_cut, delta_cut : int, float or array-like
+        LeBaron cuts (1 to 4), NaN when the quantity is out of range. Arrays are broadcast together
+    table : array-like
+        4x4x4x4 table of correction factors, LEBARON_TABLE by default
+
+    Returns
+    -------
+    dif_correction_factor : float or float array
+        correction factor, NaN where any cut is NaN or out of range
+    """
+    table = np.asarray(table, dtype=np.float64)
+    if table.shape != (4, 4, 4, 4):
+        raise ValueError("LeBaron table must be 4x4x4x4")
+    cuts = np.stack(np.broadcast_arrays(*(np.asarray(value, dtype=np.float64)
+                                          for value in (zenith_cut, geometric_cut, epsilon_cut, delta_cut))))
+    with np.errstate(invalid="ignore"):
+        valid = ((cuts >= 1) & (cuts <= 4) & (cuts == np.floor(cuts))).all(axis=0)
+    index = np.where(valid, cuts, 1).astype(np.intp) - 1
+    return np.where(valid, table[tuple(index)], np.nan)[()]
@@ -0,0 +1,156 @@
+from typing import NamedTuple
+import numpy as np
+import solarpy as sp
+from lebaron import astronomy
+from lebaron.instrumentation import stage
+from lebaron.parallel import map_day_blocks
+from lebaron.table import LEBARON_TABLE, lebaron_cuts, lebaron_factor
+
+
+class SolarGeometry(NamedTuple):
+    zenithal_angle: np.ndarray  # In radians
+    eq_time: np.ndarray  # In minutes
+    gon: np.ndarray
+    air_mass: np.ndarray
+    daylight: np.ndarray  # True strictly between sunrise and sunset
+    c_i: np.ndarray
+
+
+class LeBaronResult(NamedTuple):
+    zenithal_angle: np.ndarray  # In radians
+    c_i: np.ndarray
+    dir_nu: np.ndarray
+    epsilon: np.ndarray
+    delta: np.ndarray
+    zenith_cut: np.ndarray
+    geometric_cut: np.ndarray
+    epsilon_cut: np.ndarray
+    delta_cut: np.ndarray
+    dif_correction_factor: np.ndarray
+
+
+def solar_geometry(dates, lat, lng, lng_std, altitude, shadowband_width, shadowband_radius):
+    """
+    Site and time dependent terms of the LeBaron correction, which do not depend on the measurements
+
+    Parameters
+    ----------
+    dates : array-like
+        standard (or local) times, as a DatetimeIndex, Series or datetime64 array
+    lat, lng, lng_std, altitude, shadowband_width, shadowband_radius : float
+        site and shadowband parameters, as in dif_correction()
+
+    Returns
+    -------
+    geometry : SolarGeometry
+        arrays of zenith angle, equation of time, extraterrestrial irradiance, air mass, daylight flag and C_i
+    """
+    sp.check_lat(lat)
+    sp.check_alt(altitude)
+    dates = astronomy.to_datetime64(dates)
+
+    with stage("solar_geometry", len(dates)) as timer:
+        index, days = astronomy.daily_index(dates)
+        timer.add_days(len(days))
+        day = astronomy.day_of_the_year(days)
+        declination = astronomy.declination(day)
+        sunset_hour_angle = astronomy.sunset_hour_angle(day, lat)
+        sunrise = astronomy.sunrise_time(days, sunset_hour_angle)[index]
+        sunset = astronomy.sunset_time(days, sunset_hour_angle)[index]
+        zenithal_angle = astronomy.theta_z(astronomy.standard2solar_time(dates, lng, lng_std), lat)
+        air_mass = astronomy.air_mass_kastenyoung1989(np.rad2deg(zenithal_angle), altitude)
+        c_i = 1 / (1 - (2 * shadowband_width) / (np.pi * shadowband_radius) *
+                   ((np.cos(declination)) ** 3) *
+                   (np.sin(np.deg2rad(lat)) *
+                    np.sin(declination * sunset_hour_angle) +
+                    np.cos(np.deg2rad(lat)) * np.cos(declination) * np.sin(sunset_hour_angle)))
+        return SolarGeometry(zenithal_angle, astronomy.eq_time(day)[index], astronomy.gon(day)[index], air_mass,
+                             (sunrise < dates) & (dates < sunset), c_i[index])
+
+
+def dif_correction(dates, glo_h, dif_hu, lat, lng, lng_std, altitude, shadowband_width, shadowband_radius,
+                   table=LEBARON_TABLE, ephemeris=None, workers=1):
+    """
+    Vectorized equivalent of lebaron.shadowband.SolarMeasurement for whole arrays of measurements of one site
+
+    Parameters
+    ----------
+    dates : array-like
+        standard (or local) times, as a DatetimeIndex, Series or datetime64 array
+    glo_h : array-like
+        global horizontal irradiance
+    dif_hu : array-like
+        diffuse horizontal irradiance measured under the shadowband
+    lat : float
+        latitude (-90 to 90) in degrees
+    lng : float
+        longitude (-180 to 180) in degrees, west negative
+    lng_std : float
+        standard longitude (-180 to 180) in degrees, west negative
+    altitude : float
+        altitude above sea level in meters
+    shadowband_width : float
+        shadowband width
+    shadowband_radius : float
+        shadowband radius, in the same units as the width
+    table : array-like
+        4x4x4x4 table of LeBaron correction factors, LEBARON_TABLE by default
+    ephemeris : lebaron.ephemeris.Ephemeris, optional
+        precomputed geometry of this site covering dates, used instead of computing it
+    workers : int
+        number of threads processing day blocks concurrently, see lebaron.parallel.map_day_blocks()
+
+    Returns
+    -------
+    result : LeBaronResult
+        arrays of zenith angle, C_i, direct irradiance, epsilon, delta, the four LeBaron cuts and the correction
+        factor. Cuts and factor are NaN where SolarMeasurement leaves them as NaN or None
+    """
+    site = (lat, lng, lng_std, altitude, shadowband_width, shadowband_radius)
+    if workers > 1:
+        return map_day_blocks(lambda *block: dif_correction(*block, *site, table=table, ephemeris=ephemeris), dates,
+                              (astronomy.to_datetime64(dates), np.ravel(glo_h), np.ravel(dif_hu)), workers)
+    if ephemeris is None:
+        geometry = solar_geometry(dates, *site)
+    elif ephemeris.site == site:
+        geometry = ephemeris.take(dates)
+    else:
+        raise ValueError("ephemeris was built for a different site")
+    glo_h = np.asarray(glo_h, dtype=np.float64).ravel()
+    dif_hu = np.asarray(dif_hu, dtype=np.float64).ravel()
+    return lebaron_from_geometry(geometry, glo_h, dif_hu, table=table)
+
+
+def lebaron_from_geometry(geometry, glo_h, dif_hu, table=LEBARON_TABLE):
+    """
+    LeBaron correction of the measurements given their precomputed SolarGeometry
+
+    Parameters
+    ----------
+    geometry : SolarGeometry
+        geometry of each measurement
+    glo_h : float array
+        global horizontal irradiance
+    dif_hu : float array
+        diffuse horizontal irradiance measured under the shadowband
+    table : array-like
+        4x4x4x4 table of LeBaron correction factors, LEBARON_TABLE by default
+
+    Returns
+    -------
+    result : LeBaronResult
+        as returned by dif_correction()
+    """
+    with stage("lebaron", len(glo_h)) as timer:
+        zenithal_angle = geometry.zenithal_angle
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dir_nu = (glo_h - dif_hu) / np.cos(zenithal_angle)
+            delta = dif_hu * geometry.air_mass / geometry.gon
+            epsilon = np.where(geometry.daylight, (dif_hu + dir_nu) / dif_hu, np.nan)
+        c_i = geometry.c_i
+        zenith_cut, geometric_cut, epsilon_cut, delta_cut = lebaron_cuts(np.rad2deg(zenithal_angle), c_i, epsilon,
+                                                                         delta)
+        dif_correction_factor = lebaron_factor(zenith_cut, geometric_cut, epsilon_cut, delta_cut, table=table)
+        timer.count_nan(dif_correction_factor)
+        return LeBaronResult(zenithal_angle, c_i, dir_nu, epsilon, delta, zenith_cut, geometric_cut, epsilon_cut,
+                             delta_cut, dif_correction_factor)
@@ -0,0 +1,98 @@
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+
+class IntegrityReport(NamedTuple):
+    missing: np.ndarray  # (k, 2) datetime64, first and last grid timestamp of each run of missing timestamps
+    duplicates: np.ndarray  # (k, 2) int, [start, stop) rows repeating the timestamp of the row before them
+    out_of_order: np.ndarray  # (k, 2) int, [start, stop) rows earlier than the row before them
+    off_grid: np.ndarray  # (k, 2) int, [start, stop) rows not on the grid or outside [start, end]
+    missing_count: int  # Grid timestamps not in dates
+    expected: int  # Timestamps in the grid
+
+
+def check_timestamps(dates, freq="min", start=None, end=None):
+    """
+    Timestamp integrity of a station file against a regular grid, without building sets of Timestamps
+
+    Parameters
+    ----------
+    dates : array-like
+        timestamps, normally sorted
+    freq : str or timedelta
+        nominal frequency, as accepted by pandas.tseries.frequencies.to_offset()
+    start, end : datetime-like, optional
+        first and last timestamp of the grid, the first and last of dates by default
+
+    Returns
+    -------
+    report : IntegrityReport
+        missing ranges, duplicated, out of order and off grid runs of rows, missing count and grid size
+    """
+    dates, step, start, positions, on_grid, expected = _grid(dates, freq, start, end)
+    previous = dates[:-1].astype(np.int64)
+    current = dates[1:].astype(np.int64)
+    duplicates = _runs(np.r_[False, current == previous])
+    out_of_order = _runs(np.r_[False, current < previous])
+    present = np.zeros(expected, dtype=bool)
+    present[positions[on_grid]] = True
+    missing = start + _runs(~present) * step - np.array([0, 1]) * step  # [start, stop) to first and last timestamp
+    return IntegrityReport(missing, duplicates, out_of_order, _runs(~on_grid), expected - int(present.sum()), expected)
+
+
+def reindex_to_grid(dates, *columns, freq="min", start=None, end=None):
+    """
+    Reindexes columns onto the full regular grid in one pass, keeping the first row of duplicated timestamps and
+    leaving NaN where timestamps are missing. Off grid rows are dropped.
+
+    Parameters
+    ----------
+    dates : array-like
+        timestamps of the rows
+    columns : array-like
+        columns aligned with dates
+    freq : str or timedelta
+        nominal frequency, as accepted by pandas.tseries.frequencies.to_offset()
+    start, end : datetime-like, optional
+        first and last timestamp of the grid, the first and last of dates by default
+
+    Returns
+    -------
+    grid : datetime64[ns] array
+        every timestamp of the grid
+    columns : list of float arrays
+        columns on the grid
+    """
+    dates, step, start, positions, on_grid, expected = _grid(dates, freq, start, end)
+    rows = np.flatnonzero(on_grid)
+    positions = positions[rows]
+    if np.any(np.diff(positions) <= 0):
+        positions, first = np.unique(positions, return_index=True)
+        rows = rows[first]
+    grid = start + np.arange(expected) * step
+    reindexed = []
+    for column in columns:
+        values = np.full(expected, np.nan)
+        values[positions] = np.asarray(column, dtype=np.float64)[rows]
+        reindexed.append(values)
+    return grid, reindexed
+
+
+def _grid(dates, freq, start, end):
+    dates = np.asarray(dates, dtype="datetime64[ns]").ravel()
+    step = np.timedelta64(to_offset(freq).nanos, "ns")
+    valid = ~np.isnat(dates)
+    start = np.datetime64(dates[valid].min() if start is None else pd.Timestamp(start).to_datetime64(), "ns")
+    end = np.datetime64(dates[valid].max() if end is None else pd.Timestamp(end).to_datetime64(), "ns")
+    expected = int((end - start) // step) + 1
+    positions, remainder = np.divmod((dates - start).astype(np.int64), step.astype(np.int64))
+    on_grid = valid & (remainder == 0) & (positions >= 0) & (positions < expected)
+    return dates, step, start, positions, on_grid, expected
+
+
+def _runs(mask):
+    # [start, stop) of each run of True values
+    edges = np.flatnonzero(np.diff(np.r_[0, mask.astype(np.int8), 0]))
+    return edges.reshape(-1, 2)
@@ -1,5 +1,161 @@
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+from lebaron.instrumentation import stage
 
+# Flag bits set on a measurement when it fails a test. Measurements that are NaN are not flagged
+GHI_PHYSICAL = 1  # GHI outside the physically possible limits
+GHI_EXTREME = 2  # GHI outside the extremely rare limits
+DIF_PHYSICAL = 4
+DIF_EXTREME = 8
+DNI_PHYSICAL = 16
+DNI_EXTREME = 32
+CLOSURE = 64  # GHI / (DIF + DNI cos(zenith)) outside the comparison limits
+DIFFUSE_RATIO = 128  # DIF / GHI above the comparison limit
 
-def gon_factor(gon_value, theta_z_value):
-    return gon_value * (np.cos(theta_z_value)) ** 1.2
+FLAG_NAMES = {GHI_PHYSICAL: "GHI_PHYSICAL", GHI_EXTREME: "GHI_EXTREME", DIF_PHYSICAL: "DIF_PHYSICAL",
+              DIF_EXTREME: "DIF_EXTREME", DNI_PHYSICAL: "DNI_PHYSICAL", DNI_EXTREME: "DNI_EXTREME",
+              CLOSURE: "CLOSURE", DIFFUSE_RATIO: "DIFFUSE_RATIO"}
+
+PHYSICAL_LOWER_LIMIT = -4
+EXTREME_LOWER_LIMIT = -2
+
+
+def gon_factor(gon_value, theta_z_value, exponent=1.2):
+    return gon_value * (np.cos(theta_z_value)) ** exponent
+
+
+def qc_flags(glo_h, dif_hu, theta_z, gon, dir_n=None, workers=1):
+    """
+    Full QC verdict in one pass: limits tests of limit_flags() and comparison tests of comparison_flags(), sharing the
+    zenith and gon_factor arrays
+
+    Parameters
+    ----------
+    glo_h, dif_hu, theta_z, gon, dir_n : array-like
+        as in limit_flags()
+    workers : int
+        number of threads flagging contiguous blocks of measurements concurrently. NumPy releases the GIL inside the
+        tests, and each block writes its own slice of the result
+
+    Returns
+    -------
+    flags : uint16 array
+        bitmask of the failed tests of each measurement
+    """
+    glo_h, dif_hu, theta_z, gon, dir_n = _as_arrays(glo_h, dif_hu, theta_z, gon, dir_n)
+    shape = np.broadcast(glo_h, dif_hu, theta_z, gon).shape
+    flags = np.zeros(shape, dtype=np.uint16)
+    with stage("qc_flags", flags.size) as timer:
+        timer.count_nan(glo_h)
+        if workers <= 1 or flags.ndim == 0 or len(flags) < 2:
+            _qc_flags(flags, glo_h, dif_hu, theta_z, gon, dir_n)
+            return flags
+        values = [None if value is None else np.broadcast_to(value, shape)
+                  for value in (glo_h, dif_hu, theta_z, gon, dir_n)]
+        edges = np.linspace(0, len(flags), min(workers, len(flags)) + 1).astype(np.int64)
+        blocks = [slice(start, stop) for start, stop in zip(edges[:-1], edges[1:])]
+        with ThreadPoolExecutor(max_workers=len(blocks)) as executor:
+            list(executor.map(lambda rows: _qc_flags(flags[rows], *(None if value is None else value[rows]
+                                                                    for value in values)), blocks))
+        return flags
+
+
+def limit_flags(glo_h, dif_hu, theta_z, gon, dir_n=None):
+    """
+    BSRN physically possible and extremely rare limits tests over whole arrays
+
+    Parameters
+    ----------
+    glo_h : array-like
+        global horizontal irradiance in W/m2
+    dif_hu : array-like
+        diffuse horizontal irradiance in W/m2
+    theta_z : array-like
+        zenith angle in radians
+    gon : array-like
+        extraterrestrial irradiance on a plane normal to the radiation in W/m2
+    dir_n : array-like, optional
+        direct normal irradiance in W/m2, tested when given
+
+    Returns
+    -------
+    flags : uint16 array
+        bitmask of the failed tests (GHI_PHYSICAL, GHI_EXTREME, DIF_PHYSICAL, ...) of each measurement
+
+    Notes
+    -----
+    The cosine of the zenith angle is taken as 0 when the sun is below the horizon, so the upper limits at night are
+    the constant terms.
+    """
+    glo_h, dif_hu, theta_z, gon, dir_n = _as_arrays(glo_h, dif_hu, theta_z, gon, dir_n)
+    factor = gon_factor(gon, np.minimum(theta_z, np.pi / 2))
+    flags = np.zeros(np.broadcast(glo_h, dif_hu, factor).shape, dtype=np.uint16)
+    _limit_flags(flags, glo_h, dif_hu, theta_z, gon, dir_n, factor)
+    return flags
+
+
+def comparison_flags(glo_h, dif_hu, theta_z, dir_n=None):
+    """
+    BSRN comparison tests over whole arrays
+
+    The closure test, run when dir_n is given and DIF + DNI cos(zenith) > 50 W/m2, flags CLOSURE when
+    GHI / (DIF + DNI cos(zenith)) is outside 1 +/- 8% for zenith < 75º or 1 +/- 15% for 75º <= zenith < 93º.
+    The diffuse ratio test, run when GHI > 50 W/m2, flags DIFFUSE_RATIO when DIF / GHI exceeds 1.05 for zenith < 75º
+    or 1.10 for 75º <= zenith < 93º.
+
+    Parameters
+    ----------
+    glo_h, dif_hu, theta_z, dir_n : array-like
+        as in limit_flags()
+
+    Returns
+    -------
+    flags : uint16 array
+        bitmask of the failed tests (CLOSURE, DIFFUSE_RATIO) of each measurement
+    """
+    glo_h, dif_hu, theta_z, dir_n = _as_arrays(glo_h, dif_hu, theta_z, dir_n)
+    flags = np.zeros(np.broadcast(glo_h, dif_hu, theta_z).shape, dtype=np.uint16)
+    _comparison_flags(flags, glo_h, dif_hu, theta_z, dir_n)
+    return flags
+
+
+def _as_arrays(*values):
+    return tuple(None if value is None else np.asarray(value, dtype=np.float64) for value in values)
+
+
+def _qc_flags(flags, glo_h, dif_hu, theta_z, gon, dir_n):
+    factor = gon_factor(gon, np.minimum(theta_z, np.pi / 2))
+    _limit_flags(flags, glo_h, dif_hu, theta_z, gon, dir_n, factor)
+    _comparison_flags(flags, glo_h, dif_hu, theta_z, dir_n)
+
+
+def _limit_flags(flags, glo_h, dif_hu, theta_z, gon, dir_n, factor):
+    _flag(flags, glo_h, PHYSICAL_LOWER_LIMIT, 1.5 * factor + 100, GHI_PHYSICAL)
+    _flag(flags, glo_h, EXTREME_LOWER_LIMIT, 1.2 * factor + 50, GHI_EXTREME)
+    _flag(flags, dif_hu, PHYSICAL_LOWER_LIMIT, 0.95 * factor + 50, DIF_PHYSICAL)
+    _flag(flags, dif_hu, EXTREME_LOWER_LIMIT, 0.75 * factor + 30, DIF_EXTREME)
+    if dir_n is not None:
+        _flag(flags, dir_n, PHYSICAL_LOWER_LIMIT, gon, DNI_PHYSICAL)
+        _flag(flags, dir_n, EXTREME_LOWER_LIMIT, 0.95 * gon_factor(gon, np.minimum(theta_z, np.pi / 2), exponent=0.2) +
+              10, DNI_EXTREME)
+
+
+def _comparison_flags(flags, glo_h, dif_hu, theta_z, dir_n):
+    zenith_deg = np.rad2deg(theta_z)
+    low_sun = (zenith_deg >= 75) & (zenith_deg < 93)
+    tested = (zenith_deg < 75) | low_sun
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if dir_n is not None:
+            sum_sw = dif_hu + dir_n * np.cos(theta_z)
+            closure = glo_h / sum_sw
+            tolerance = np.where(low_sun, 0.15, 0.08)
+            _flag(flags, np.where(tested & (sum_sw > 50), closure, np.nan), 1 - tolerance, 1 + tolerance, CLOSURE)
+        diffuse_ratio = dif_hu / glo_h
+        _flag(flags, np.where(tested & (glo_h > 50), diffuse_ratio, np.nan), -np.inf, np.where(low_sun, 1.10, 1.05),
+              DIFFUSE_RATIO)
+
+
+def _flag(flags, values, lower, upper, flag):
+    # Sets flag where values are not strictly between lower and upper
+    values = np.asarray(values, dtype=np.float64)
+    np.bitwise_or(flags, flag, out=flags, where=(values <= lower) | (values >= upper))
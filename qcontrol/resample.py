@@ -0,0 +1,101 @@
+from typing import NamedTuple
+import numpy as np
+from pandas.tseries.frequencies import to_offset
+
+ALL_FLAGS = 0xFFFF  # Every qcontrol.qcontrol flag bit
+PERIOD_UNITS = {"h": "h", "D": "D", "M": "M", "Y": "Y"}  # Bucket frequency to datetime64 unit
+
+
+class Resampled(NamedTuple):
+    periods: np.ndarray  # datetime64, start of each bucket, every bucket from the first to the last sample
+    sums: np.ndarray  # Sum of the valid samples, (buckets,) or (buckets, columns)
+    means: np.ndarray  # NaN where a bucket has no valid sample
+    counts: np.ndarray  # Valid samples
+    expected: np.ndarray  # (buckets,) samples of a complete bucket at the sample frequency
+    completeness: np.ndarray  # counts / expected
+
+
+def resample(dates, values, flags=None, freq="h", exclude=ALL_FLAGS, sample_freq="min"):
+    """
+    QC aware resampling of regular samples into hourly, daily, monthly or yearly buckets in one grouped pass: each
+    valid sample gets an integer bucket id and sums and counts are bincount reductions over them, for every column at
+    once. Samples that are NaN or have any of the exclude bits set in flags are left out.
+
+    Parameters
+    ----------
+    dates : array-like
+        timestamps of the samples, in any order
+    values : array-like
+        (samples,) or (samples, columns) values, e.g. GHI and corrected DIF or one column per station on a shared grid
+    flags : array-like, optional
+        (samples,) or (samples, columns) qcontrol.qcontrol bitmasks
+    freq : str
+        bucket frequency, "h", "D", "M" or "Y"
+    exclude : int
+        flag bits that exclude a sample, all of them by default
+    sample_freq : str or timedelta
+        nominal frequency of the samples, as accepted by pandas.tseries.frequencies.to_offset(), for the expected
+        samples of each bucket
+
+    Returns
+    -------
+    resampled : Resampled
+        bucket starts, sums, means, valid counts, expected counts and completeness. Sums of irradiance samples in W/m2
+        times the sample period in hours are irradiation in Wh/m2
+
+    Notes
+    -----
+    Duplicated timestamps are counted twice, see qcontrol.integrity.reindex_to_grid() to drop them first.
+    """
+    if freq not in PERIOD_UNITS:
+        raise ValueError(f"unknown bucket frequency '{freq}'")
+    dates = np.asarray(dates, dtype="datetime64[ns]").ravel()
+    values = np.asarray(values, dtype=np.float64)
+    vector = values.ndim == 1
+    columns = 1 if vector else values.shape[1]
+    values = values.reshape(len(dates), columns)
+
+    dated = ~np.isnat(dates)
+    valid = ~np.isnan(values) & dated[:, None]
+    if flags is not None:
+        valid &= (np.asarray(flags).reshape(len(dates), -1) & exclude) == 0
+    ids, periods = _bucket_ids(dates, dated, PERIOD_UNITS[freq])
+
+    # One bincount per column over the shared bucket ids, on contiguous columns
+    counts = np.empty((len(periods), columns), dtype=np.int64)
+    sums = np.empty((len(periods), columns))
+    for column in range(columns):
+        column_valid = np.ascontiguousarray(valid[:, column])
+        counts[:, column] = np.bincount(ids[column_valid], minlength=len(periods))
+        sums[:, column] = np.bincount(ids, weights=np.where(column_valid, values[:, column], 0),
+                                      minlength=len(periods))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = np.where(counts > 0, sums / counts, np.nan)
+    bounds = np.append(periods, periods[-1] + 1 if len(periods) else periods).astype("datetime64[ns]")
+    expected = np.diff(bounds.astype(np.int64)) // to_offset(sample_freq).nanos
+    completeness = counts / expected[:, None]
+    if vector:
+        sums, means, counts, completeness = sums[:, 0], means[:, 0], counts[:, 0], completeness[:, 0]
+    return Resampled(periods, sums, means, counts, expected, completeness)
+
+
+def _bucket_ids(dates, dated, unit):
+    # Bucket of each timestamp (0 for NaT) and start of every bucket, with integer arithmetic on the nanoseconds
+    if not dated.any():
+        return np.zeros(len(dates), dtype=np.int64), np.array([], dtype=f"datetime64[{unit}]")
+    nanos = dates.view(np.int64)
+    if unit in ("h", "D"):
+        step = np.timedelta64(1, unit).astype("timedelta64[ns]").astype(np.int64)
+        absolute = np.floor_divide(nanos, step)
+        everywhere = dated.all()
+        first, last = (absolute.min(), absolute.max()) if everywhere else (absolute[dated].min(), absolute[dated].max())
+        periods = np.arange(first, last + 1).astype(f"datetime64[{unit}]")
+        absolute -= first
+        return absolute if everywhere else np.where(dated, absolute, 0), periods
+    # Months and years through a lookup of the period of each day, the calendar conversion being slow per sample
+    day = np.floor_divide(nanos, 86400 * 10 ** 9)
+    first, last = day[dated].min(), day[dated].max()
+    day_periods = np.arange(first, last + 1).astype("datetime64[D]").astype(f"datetime64[{unit}]")
+    periods = np.arange(day_periods[0], day_periods[-1] + 1)
+    lookup = (day_periods - periods[0]).astype(np.int64)
+    return np.where(dated, lookup[np.where(dated, day - first, 0)], 0), periods
@@ -0,0 +1,51 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import baseline  # noqa: E402
+from benchmarks.synthetic import SITE, synthetic_station  # noqa: E402
+
+CUTS = ("zenith_cut", "geometric_cut", "epsilon_cut", "delta_cut")
+QUANTITIES = ("zenithal_angle", "c_i", "epsilon", "delta")
+
+
+def baseline_reference(dates, glo_h, dif_hu, site):
+    """
+    Quantities, cuts and factor of the original SolarMeasurement for each row, NaN where it has None
+    """
+    rows = []
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for date, glo, dif in zip(pd.DatetimeIndex(dates).to_pydatetime(), glo_h.tolist(), dif_hu.tolist()):
+            measurement = baseline.SolarMeasurement(date, glo, dif, **site)
+            rows.append([getattr(measurement, name) for name in QUANTITIES] + list(measurement.lebaron_parameters) +
+                        [measurement.dif_correction_factor])
+    columns = np.array([[np.nan if value is None else value for value in row] for row in rows], dtype=np.float64)
+    return dict(zip(QUANTITIES + CUTS + ("dif_correction_factor",), columns.T))
+
+
+def assert_matches(result, reference, names=None):
+    """
+    Cuts and factor equal, NaN included, quantities within 1e-12 as in benchmarks.golden
+    """
+    for name in reference if names is None else names:
+        actual = np.asarray(result[name], dtype=np.float64)
+        if name in QUANTITIES:
+            np.testing.assert_allclose(actual, reference[name], rtol=1e-12, atol=0, err_msg=name)
+        else:
+            np.testing.assert_array_equal(actual, reference[name], err_msg=name)
+
+
+@pytest.fixture(scope="session", params=[(-32.898, "2022-01-01"), (0.0, "2022-06-20"), (60.0, "2022-12-30")],
+                ids=["mendoza-january", "equator-june", "60N-new-year"])
+def station(request):
+    """
+    Three days of synthetic measurements every 10 minutes, the site and the original SolarMeasurement references
+    """
+    lat, start = request.param
+    site = dict(SITE, lat=lat)
+    dates, glo_h, dif_hu = (column[::10] for column in synthetic_station(3, start=start, lat=lat, seed=7))
+    return dates, glo_h, dif_hu, site, baseline_reference(dates, glo_h, dif_hu, site)
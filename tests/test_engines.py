@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import CUTS, assert_matches
+from lebaron.astronomy import to_datetime64
+from lebaron.ephemeris import Ephemeris
+from lebaron.instrumentation import instrumented
+from lebaron.kernel import fused_lebaron, numba
+from lebaron.multisite import dif_correction_factors, site_geometry, time_terms
+from lebaron.pipeline import correct_blocks
+from lebaron.reader import StationBlock
+from lebaron.shadowband import SolarMeasurement, SolarMeasurementSet
+from lebaron.vectorized import dif_correction, solar_geometry
+
+KERNELS = ["numpy"] + (["numba"] if numba is not None else [])
+
+
+def test_dif_correction(station):
+    dates, glo_h, dif_hu, site, reference = station
+    assert_matches(dif_correction(dates, glo_h, dif_hu, **site)._asdict(), reference)
+
+
+def test_dif_correction_threads(station):
+    dates, glo_h, dif_hu, site, reference = station
+    result = dif_correction(dates, glo_h, dif_hu, **site, workers=3)
+    assert_matches(result._asdict(), reference)
+    for threaded, single in zip(result, dif_correction(dates, glo_h, dif_hu, **site)):
+        np.testing.assert_array_equal(threaded, single)
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_fused_lebaron(station, kernel):
+    dates, glo_h, dif_hu, site, reference = station
+    result = fused_lebaron(solar_geometry(dates, **site), glo_h, dif_hu, cuts=True, kernel=kernel)
+    assert_matches(result._asdict(), reference, CUTS + ("dif_correction_factor",))
+
+
+def test_site_geometry(station):
+    dates, glo_h, dif_hu, site, reference = station
+    geometry = site_geometry(time_terms(dates), **site)
+    for shared, single in zip(geometry, solar_geometry(dates, **site)):
+        np.testing.assert_array_equal(shared, single)
+    assert_matches(geometry._asdict(), reference, ("zenithal_angle", "c_i"))
+
+
+def test_dif_correction_factors(station):
+    dates, glo_h, dif_hu, site, reference = station
+    sites = [tuple(site.values()), tuple(dict(site, lng=site["lng"] + 10, altitude=0).values())]
+    factors = dif_correction_factors(dates, np.stack([glo_h, glo_h]), np.stack([dif_hu, dif_hu]), sites)
+    np.testing.assert_array_equal(factors[0], reference["dif_correction_factor"])
+    np.testing.assert_array_equal(factors[1], dif_correction(dates, glo_h, dif_hu, *sites[1]).dif_correction_factor)
+
+
+def test_measurement_classes(station):
+    dates, glo_h, dif_hu, site, reference = station
+    assert_matches(vars(SolarMeasurementSet(dates, glo_h, dif_hu, **site)), reference)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rows = [SolarMeasurement(date, glo, dif, **site).dif_correction_factor
+                for date, glo, dif in zip(pd.DatetimeIndex(dates).to_pydatetime(), glo_h.tolist(), dif_hu.tolist())]
+    factors = [np.nan if factor is None else factor for factor in rows]
+    np.testing.assert_array_equal(factors, reference["dif_correction_factor"])
+
+
+def test_measurement_set_rejects_slices(station):
+    dates, glo_h, dif_hu, site, _ = station
+    measurements = SolarMeasurementSet(dates, glo_h, dif_hu, **site)
+    assert measurements[-1].dif_hu == dif_hu[-1]
+    with pytest.raises(TypeError):
+        measurements[1:3]
+    with pytest.raises(IndexError):
+        measurements[len(dates)]
+
+
+def test_pipeline_and_ephemeris(station, tmp_path):
+    dates, glo_h, dif_hu, site, reference = station
+    block, = correct_blocks([StationBlock(dates, glo_h, dif_hu)], **site)
+    assert_matches(block._asdict(), reference, CUTS + ("dif_correction_factor",))
+    year = int(str(dates[0])[:4])
+    ephemeris = Ephemeris.build(year, **site, step_minutes=10)
+    ephemeris.save(tmp_path / "ephemeris.npz")
+    ephemeris = Ephemeris.load(tmp_path / "ephemeris.npz")
+    inside = dates < np.datetime64(f"{year + 1}-01-01")
+    for cached, computed in zip(ephemeris.take(dates[inside]), solar_geometry(dates[inside], **site)):
+        np.testing.assert_array_equal(cached, computed)
+
+
+def test_tz_aware_dates_keep_wall_clock():
+    local = pd.date_range("2022-01-01 09:00", periods=3, freq="h", tz="America/Argentina/Mendoza")
+    naive = local.tz_localize(None)
+    np.testing.assert_array_equal(to_datetime64(local), naive.to_numpy())
+    np.testing.assert_array_equal(to_datetime64(pd.Series(local)), naive.to_numpy())
+
+
+def test_instrumentation_counts_days_and_cache(station):
+    dates, glo_h, dif_hu, site, reference = station
+    SolarMeasurement.geometry_cache.clear()
+    with instrumented() as instrumentation, np.errstate(divide="ignore", invalid="ignore"):
+        solar_geometry(dates, **site)
+        for date, glo, dif in zip(pd.DatetimeIndex(dates).to_pydatetime(), glo_h.tolist(), dif_hu.tolist()):
+            SolarMeasurement(date, glo, dif, **site).dif_correction_factor
+    report = instrumentation.report()
+    assert (report.days, report.cache_misses, report.cache_hits) == (3, 3, len(dates) - 3)
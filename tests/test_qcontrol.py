@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from qcontrol.integrity import check_timestamps, reindex_to_grid
+from qcontrol.qcontrol import CLOSURE, DIF_EXTREME, DIF_PHYSICAL, DIFFUSE_RATIO, GHI_EXTREME, GHI_PHYSICAL, \
+    comparison_flags, limit_flags, qc_flags
+from qcontrol.resample import resample
+
+NIGHT = np.deg2rad(100)
+# GHI, DIF, zenith angle and expected flags with gon = 1367: upper limits at zenith 0 are 2150.5 and 1690.4 for GHI,
+# 1348.65 and 1055.25 for DIF, and 100 and 50 for GHI at night
+CASES = [
+    (500, 100, 0, 0),
+    (1800, 100, 0, GHI_EXTREME),
+    (2200, 100, 0, GHI_PHYSICAL | GHI_EXTREME),
+    (500, 1100, 0, DIF_EXTREME | DIFFUSE_RATIO),
+    (-5, -5, 0, GHI_PHYSICAL | GHI_EXTREME | DIF_PHYSICAL | DIF_EXTREME),
+    (-2, 0, 0, GHI_EXTREME),  # Limits are exclusive
+    (100, 120, 0, DIFFUSE_RATIO),
+    (100, 108, np.deg2rad(80), 0),  # 1.10 above 75º
+    (np.nan, 100, 0, 0),
+    (0, 0, NIGHT, 0),
+    (120, 0, NIGHT, GHI_PHYSICAL | GHI_EXTREME),
+]
+
+
+def _columns():
+    glo_h, dif_hu, theta_z, expected = (np.array(column, dtype=np.float64) for column in zip(*CASES))
+    return glo_h, dif_hu, theta_z, expected.astype(np.uint16)
+
+
+def test_qc_flags():
+    glo_h, dif_hu, theta_z, expected = _columns()
+    flags = qc_flags(glo_h, dif_hu, theta_z, 1367)
+    np.testing.assert_array_equal(flags, expected)
+    np.testing.assert_array_equal(flags, limit_flags(glo_h, dif_hu, theta_z, 1367) |
+                                  comparison_flags(glo_h, dif_hu, theta_z))
+
+
+def test_qc_flags_threads():
+    glo_h, dif_hu, theta_z, expected = _columns()
+    np.testing.assert_array_equal(qc_flags(glo_h, dif_hu, theta_z, 1367, workers=4), expected)
+
+
+def test_closure():
+    flags = comparison_flags([500, 500, 500], [100, 100, 10], 0, dir_n=[400, 300, 20])
+    np.testing.assert_array_equal(flags & CLOSURE, [0, CLOSURE, 0])  # The last one is below 50 W/m2, not tested
+
+
+def test_check_timestamps():
+    dates = np.array(["2022-01-01T00:00", "2022-01-01T00:01", "2022-01-01T00:01", "2022-01-01T00:03",
+                      "2022-01-01T00:02", "2022-01-01T00:04:30", "2022-01-01T00:05"], dtype="datetime64[ns]")
+    report = check_timestamps(dates, freq="min", end="2022-01-01 00:07")
+    np.testing.assert_array_equal(report.missing, np.array([["2022-01-01T00:04", "2022-01-01T00:04"],
+                                                            ["2022-01-01T00:06", "2022-01-01T00:07"]],
+                                                           dtype="datetime64[ns]"))
+    np.testing.assert_array_equal(report.duplicates, [[2, 3]])
+    np.testing.assert_array_equal(report.out_of_order, [[4, 5]])
+    np.testing.assert_array_equal(report.off_grid, [[5, 6]])
+    assert (report.missing_count, report.expected) == (3, 8)
+
+    grid, (values,) = reindex_to_grid(dates, np.arange(7), freq="min", end="2022-01-01 00:07")
+    assert len(grid) == 8
+    np.testing.assert_array_equal(values, [0, 1, 4, 3, np.nan, 6, np.nan, np.nan])
+
+
+@pytest.fixture
+def two_hours():
+    dates = np.arange(np.datetime64("2022-01-01T10:00", "ns"), np.datetime64("2022-01-01T12:00", "ns"),
+                      np.timedelta64(1, "m"))
+    values = np.ones((len(dates), 2))
+    values[5, 0] = np.nan
+    values[60:, 1] = np.nan
+    flags = np.zeros(len(dates), dtype=np.uint16)
+    flags[10] = GHI_PHYSICAL
+    flags[11] = DIFFUSE_RATIO
+    return dates, values, flags
+
+
+def test_resample_hourly(two_hours):
+    dates, values, flags = two_hours
+    result = resample(dates, values, flags, freq="h", exclude=GHI_PHYSICAL)
+    np.testing.assert_array_equal(result.periods, np.array(["2022-01-01T10", "2022-01-01T11"], dtype="datetime64[h]"))
+    np.testing.assert_array_equal(result.counts, [[58, 59], [60, 0]])
+    np.testing.assert_array_equal(result.sums, [[58, 59], [60, 0]])
+    np.testing.assert_array_equal(result.means, [[1, 1], [1, np.nan]])
+    np.testing.assert_array_equal(result.expected, [60, 60])
+    np.testing.assert_allclose(result.completeness, [[58 / 60, 59 / 60], [1, 0]])
+
+
+def test_resample_daily_and_monthly(two_hours):
+    dates, values, flags = two_hours
+    dates = dates.copy()
+    dates[0] = np.datetime64("NaT")
+    daily = resample(dates, values[:, 0], flags, freq="D")
+    assert daily.counts.tolist() == [116] and daily.expected.tolist() == [1440]
+    monthly = resample(dates, values[:, 0], freq="M")
+    assert monthly.periods.tolist() == [np.datetime64("2022-01", "M").item()]
+    assert monthly.counts.tolist() == [118] and monthly.expected.tolist() == [31 * 1440]
+
+
+def test_resample_rejects_unknown_frequency(two_hours):
+    dates, values, _ = two_hours
+    with pytest.raises(ValueError):
+        resample(dates, values, freq="W")
@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.synthetic import SITE, synthetic_station, write_station_csv
+from lebaron.archive import StationArchive, import_station_csv
+from lebaron.incremental import load_watermarks, read_tail, update_station
+from lebaron.pipeline import StationJob, correct_blocks, correct_manifest, correct_station_file, \
+    read_parquet_partition, write_parquet
+from lebaron.reader import StationBlock
+
+HEADER = "fecha;IRGLO;IRDIF\n"
+
+
+def _lines(*minutes):
+    return "".join(f"01/01/2022 10:{minute:02d};{500 + minute};{100 + minute}\n" for minute in minutes)
+
+
+def test_read_tail(tmp_path):
+    path = tmp_path / "station.csv"
+    path.write_text(HEADER + _lines(0, 1, 2) + "01/01/2022 10:03;5")  # Last line still being written
+    block, skipped, watermark = read_tail(path)
+    assert block.glo_h.tolist() == [500, 501, 502] and skipped == 0
+    assert watermark.last_timestamp == "2022-01-01T10:02:00.000000000"
+    assert watermark.offset == len(HEADER + _lines(0, 1, 2))
+
+    with open(path, "a") as file:
+        file.write("03;103\n" + _lines(4))
+    block, skipped, watermark = read_tail(path, watermark)
+    assert block.glo_h.tolist() == [503, 504] and skipped == 0
+
+    assert read_tail(path, watermark)[0] is None
+    path.write_text(HEADER + _lines(3, 4, 5))  # Rotated: read again from the start, old rows dropped by timestamp
+    block, skipped, watermark = read_tail(path, watermark)
+    assert block.glo_h.tolist() == [505] and skipped == 2
+
+
+def test_read_tail_rotated_to_a_longer_file(tmp_path):
+    path = tmp_path / "station.csv"
+    path.write_text(HEADER + _lines(57, 58, 59))
+    watermark = read_tail(path)[2]
+    assert watermark.first_line == _lines(57)
+    path.write_text(HEADER + _lines(0, 1, 2, 3, 4, 5).replace("01/01", "02/01"))  # Next day, longer than the old file
+    block, skipped, watermark = read_tail(path, watermark)
+    assert block.glo_h.tolist() == [500, 501, 502, 503, 504, 505] and skipped == 0
+    assert watermark.first_line == _lines(0).replace("01/01", "02/01")
+
+
+def test_update_station_rejects_shared_watermark(tmp_path):
+    site = tuple(SITE.values())
+    inputs = [tmp_path / "s1" / "raw.csv", tmp_path / "s2" / "raw.csv"]
+    for path in inputs:
+        path.parent.mkdir()
+        path.write_text(HEADER + _lines(0, 1))
+    update_station(inputs[0], tmp_path / "s1.csv", tmp_path / "state.json", *site)
+    with pytest.raises(ValueError):
+        update_station(inputs[1], tmp_path / "s2.csv", tmp_path / "state.json", *site)
+    assert update_station(inputs[1], tmp_path / "s2.csv", tmp_path / "state.json", *site, station="s2").rows == 2
+
+
+def test_update_station_equals_full_run(tmp_path):
+    station = synthetic_station(2, seed=3)
+    site = tuple(SITE.values())
+    full_input, live_input = tmp_path / "full.csv", tmp_path / "live.csv"
+    write_station_csv(station, full_input)
+    correct_station_file(full_input, tmp_path / "full_out.csv", *site)
+
+    text = full_input.read_text()
+    middle = text.index("\n", len(text) // 2) + 1
+    live_input.write_text(text[:middle + 10])
+    first = update_station(live_input, tmp_path / "live_out.csv", tmp_path / "state.json", *site)
+    with open(live_input, "a") as file:
+        file.write(text[middle + 10:])
+    second = update_station(live_input, tmp_path / "live_out.csv", tmp_path / "state.json", *site)
+    assert first.rows + second.rows == len(station.dates)
+    assert update_station(live_input, tmp_path / "live_out.csv", tmp_path / "state.json", *site).rows == 0
+    assert load_watermarks(tmp_path / "state.json")["live"] == second.watermark
+    assert (tmp_path / "live_out.csv").read_text() == (tmp_path / "full_out.csv").read_text()
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = StationArchive.create(tmp_path / "station.lba")
+    minutes = np.r_[np.arange(0, 10), np.arange(20, 30)]  # Ten minute gap
+    archive.append(np.datetime64("2022-01-01T00:00", "ns") + minutes.astype("timedelta64[m]"), minutes, minutes)
+    return archive
+
+
+@pytest.mark.parametrize("date, side, row", [
+    ("2021-12-31 23:00", "left", 0), ("2022-01-01 00:00", "left", 0), ("2022-01-01 00:00", "right", 1),
+    ("2022-01-01 00:03:30", "left", 4), ("2022-01-01 00:03:30", "right", 4), ("2022-01-01 00:09", "right", 10),
+    ("2022-01-01 00:15", "left", 10), ("2022-01-01 00:20", "left", 10), ("2022-01-01 00:29", "left", 19),
+    ("2022-01-01 00:29", "right", 20), ("2022-01-02 00:00", "left", 20),
+])
+def test_archive_locate(archive, date, side, row):
+    assert archive.locate(date, side) == row
+    minutes = archive.records["minute"]
+    expected = np.searchsorted(minutes, np.datetime64(date, "ns").astype("datetime64[m]").astype(np.int64) +
+                               (side == "right" or pd.Timestamp(date).second != 0), side="left")
+    assert row == expected
+
+
+def test_archive_read_and_blocks(archive):
+    block = archive.read("2022-01-01 00:05", "2022-01-01 00:25")
+    assert block.glo_h.tolist() == [5, 6, 7, 8, 9, 20, 21, 22, 23, 24]
+    blocks = list(archive.blocks(chunk_rows=7))
+    assert [len(block.dates) for block in blocks] == [7, 7, 6]
+    assert np.concatenate([block.dif_hu for block in blocks]).tolist() == archive.read().dif_hu.tolist()
+
+
+def test_archive_duplicates(archive, tmp_path):
+    with pytest.raises(ValueError):
+        archive.append(["2022-01-01T00:30", "2022-01-01T00:30"], [1, 2], [1, 2], duplicates="raise")
+    assert archive.append(["2022-01-01T00:29", "2022-01-01T00:30", "2022-01-01T00:30"], [0, 1, 2], [0, 1, 2]) == 1
+    assert archive.read("2022-01-01 00:29").glo_h.tolist() == [29, 1]
+    with pytest.raises(ValueError):
+        archive.append(["2022-01-01T00:15"], [0], [0])  # Out of order, not a duplicate
+
+    path = tmp_path / "duplicated.csv"
+    path.write_text(HEADER + _lines(0, 1) + "01/01/2022 10:01;999;999\n" + _lines(2))
+    imported = import_station_csv(path, tmp_path / "duplicated.lba", chunk_rows=2)
+    assert imported.read().glo_h.tolist() == [500, 501, 502]
+
+
+def test_parquet_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    station = synthetic_station(2, start="2022-01-31", seed=5)
+    blocks = list(write_parquet(correct_blocks([StationBlock(*station)], *SITE.values()), tmp_path, "mendoza"))
+    corrected, = blocks
+    for month, rows in (("2022-01", slice(0, 1440)), ("2022-02", slice(1440, None))):
+        table = read_parquet_partition(tmp_path, "mendoza", month)
+        np.testing.assert_array_equal(table["dates"].to_numpy().astype("datetime64[ns]"), corrected.dates[rows])
+        for name in ("glo_h", "dif_hu_corrected", "dif_correction_factor"):
+            np.testing.assert_array_equal(table[name].to_numpy(dtype=np.float64),
+                                          getattr(corrected, name)[rows].astype(np.float32))
+        np.testing.assert_array_equal(table["zenith_cut"].to_numpy(dtype=np.float64, na_value=np.nan),
+                                      corrected.zenith_cut[rows])
+        np.testing.assert_array_equal(table["qc_flags"].to_numpy(), corrected.qc_flags[rows])
+
+
+def test_manifest_same_named_inputs(tmp_path):
+    site = tuple(SITE.values())
+    inputs = [tmp_path / "s1" / "2022-minute-raw.csv", tmp_path / "s2" / "2022-minute-raw.csv"]
+    for seed, path in enumerate(inputs):
+        path.parent.mkdir()
+        write_station_csv(synthetic_station(1, seed=seed), path)
+    with pytest.raises(ValueError):
+        correct_manifest([StationJob(str(path), *site) for path in inputs], tmp_path / "out")
+
+    jobs = [StationJob(str(path), *site, station=path.parent.name) for path in inputs]
+    results = correct_manifest(jobs, tmp_path / "out", workers=2)
+    assert [result.error for result in results] == [None, None]
+    assert len({result.output_path for result in results}) == 2
+    for path, result in zip(inputs, results):
+        correct_station_file(path, tmp_path / "single.csv", *site)
+        assert open(result.output_path).read() == (tmp_path / "single.csv").read_text()
+
+
+def test_manifest_parquet_station_years(tmp_path):
+    pytest.importorskip("pyarrow")
+    site = tuple(SITE.values())
+    inputs = [tmp_path / "2021.csv", tmp_path / "2022.csv"]
+    for path, days, start in zip(inputs, (2, 1), ("2021-12-31", "2022-01-02")):  # Both write to month=2022-01
+        write_station_csv(synthetic_station(days, start=start), path)
+    with pytest.raises(ValueError):
+        correct_manifest([StationJob(str(path), *site) for path in inputs], tmp_path / "out", output_format="parquet")
+    with pytest.raises(ValueError):
+        correct_station_file(inputs[0], tmp_path / "out", *site, output_format="parquet")
+
+    results = correct_manifest([StationJob(str(path), *site, station="mendoza") for path in inputs], tmp_path / "out",
+                               workers=2, output_format="parquet")
+    assert [result.error for result in results] == [None, None]
+    assert len(read_parquet_partition(tmp_path / "out", "mendoza", "2022-01")) == 2880
+    assert len(read_parquet_partition(tmp_path / "out", "mendoza", "2021-12")) == 1440
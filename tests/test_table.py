@@ -0,0 +1,83 @@
+import itertools
+import numpy as np
+import pytest
+from benchmarks import baseline
+from lebaron.table import DELTA_EDGES, EPSILON_EDGES, GEOMETRIC_EDGES, LEBARON_TABLE, ZENITH_EDGES, lebaron_cut, \
+    lebaron_cuts, lebaron_factor, lebaron_scalar_cut, lebaron_scalar_cuts
+
+ALL_CUTS = list(itertools.product(range(1, 5), repeat=4))
+
+
+def _class_chain(cuts):
+    measurement = object.__new__(baseline.SolarMeasurement)
+    measurement.lebaron_parameters = cuts
+    measurement.dif_correction_factor = None
+    measurement.set_dif_correction_factor()
+    return measurement.dif_correction_factor
+
+
+def _class_cuts(zenith_angle_deg, c_i, epsilon, delta):
+    measurement = object.__new__(baseline.SolarMeasurement)
+    measurement.zenithal_angle = np.deg2rad(zenith_angle_deg)
+    measurement.c_i = c_i
+    measurement.epsilon = epsilon
+    measurement.delta = delta
+    measurement.set_lebaron_parameters()
+    return measurement.lebaron_parameters
+
+
+@pytest.mark.parametrize("cuts", ALL_CUTS)
+def test_table_matches_class_branch_chain(cuts):
+    expected = _class_chain(cuts)
+    assert expected is not None
+    assert lebaron_factor(*cuts) == LEBARON_TABLE[tuple(cut - 1 for cut in cuts)] == expected
+
+
+def test_table_matches_functional_branch_chain(monkeypatch):
+    for cuts in ALL_CUTS:
+        monkeypatch.setattr(baseline, "cut", lambda *arguments: cuts)
+        expected = baseline.set_dif_correction_factor(None, 0, 0, 0, 0, 0, 0, 0, 0)
+        assert expected == _class_chain(cuts)
+        assert lebaron_factor(*cuts) == expected
+
+
+def test_batched_factor_gathers_every_combination():
+    cuts = np.array(ALL_CUTS, dtype=np.float64).T
+    expected = np.array([_class_chain(combination) for combination in ALL_CUTS], dtype=np.float64)
+    np.testing.assert_array_equal(lebaron_factor(*cuts), expected)
+
+
+def test_factor_is_nan_for_missing_or_invalid_cuts():
+    factors = lebaron_factor([np.nan, 1, 0, 5, 1.5], 1, 1, 1)
+    assert np.isnan(factors[[0, 2, 3, 4]]).all() and factors[1] == LEBARON_TABLE[0, 0, 0, 0]
+
+
+@pytest.mark.parametrize("edges, values, expected", [
+    (ZENITH_EDGES, [0, 35, 35.0001, 50, 60, 90, 90.0001, -0.0001], [1, 1, 2, 2, 3, 4, np.nan, np.nan]),
+    (GEOMETRIC_EDGES, [0.999, 1, 1.068, 1.0681, 1.1, 1.132, 1.1321, 5], [np.nan, 1, 1, 2, 2, 3, 4, 4]),
+    (EPSILON_EDGES, [-0.1, 0, 1.253, 1.2531, 2.134, 5.980, 5.9801, np.inf], [np.nan, 1, 1, 2, 2, 3, 4, 4]),
+    (DELTA_EDGES, [-0.1, 0, 0.120, 0.1201, 0.2, 0.3, 0.3001, np.nan], [np.nan, 1, 1, 2, 2, 3, 4, np.nan]),
+])
+def test_cut_on_shared_edges(edges, values, expected):
+    np.testing.assert_array_equal(lebaron_cut(np.array(values), edges), expected)
+    np.testing.assert_array_equal([lebaron_scalar_cut(value, edges) for value in values], expected)
+
+
+@pytest.mark.parametrize("zenith, c_i, epsilon, delta", [
+    (35, 1.068, 1.253, 0.120), (90, 1.1, 2.134, 0.2), (50, 1.132, 5.980, 0.3), (60, 1, 0, 0),
+    (91, 0.9, -1, -1), (np.nan, np.nan, np.nan, np.nan),
+])
+def test_cuts_match_class_branch_chain(zenith, c_i, epsilon, delta):
+    expected = _class_cuts(zenith, c_i, epsilon, delta)
+    actual = lebaron_cuts(np.rad2deg(np.deg2rad(zenith)), c_i, epsilon, delta)
+    np.testing.assert_array_equal(np.array(actual, dtype=np.float64), np.array(expected, dtype=np.float64))
+
+
+@pytest.mark.parametrize("zenith, c_i, epsilon, delta", [
+    (35, 1.068, 1.253, 0.120), (90, 1.1, 2.134, 0.2), (50, 1.132, 5.980, 0.3), (60, 1, 0, 0),
+    (91, 0.9, -1, -1), (np.nan, np.nan, np.nan, np.nan),
+])
+def test_scalar_cuts_equal_class_branch_chain(zenith, c_i, epsilon, delta):
+    expected = _class_cuts(zenith, c_i, epsilon, delta)
+    actual = lebaron_scalar_cuts(np.rad2deg(np.deg2rad(zenith)), c_i, epsilon, delta)
+    assert repr(actual) == repr(expected)  # Same int and NaN types as the branch chain